@@ -1,7 +1,15 @@
 # api/deps.py
 import os
+import hmac
 from fastapi import Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+import utils.config  # noqa: F401  (loads .env before API_KEY is read below)
+
+try:
+    import orjson  # noqa: F401  (ORJSONResponse needs it at render time)
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as FastJSONResponse
 
 # Where we store data (aligns with your Streamlit code)
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -15,12 +23,19 @@ os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(VECTOR_DIR, exist_ok=True)
 
+# Read once at import; utils.config has already loaded .env (imported above)
+_EXPECTED_KEY = os.getenv("API_KEY", "").encode("utf-8")
+API_KEY_SET = bool(_EXPECTED_KEY)
+
+def api_key_matches(x_api_key: str) -> bool:
+    """Constant-time compare against the configured API key."""
+    return bool(x_api_key) and hmac.compare_digest(x_api_key.encode("utf-8"), _EXPECTED_KEY)
+
 def verify_api_key(x_api_key: str = Header(None)):
-    expected = os.getenv("API_KEY")
-    if not expected:
+    if not API_KEY_SET:
         # If not set on server, reject to avoid open API
         raise HTTPException(status_code=500, detail="Server misconfigured: API_KEY not set")
-    if not x_api_key or x_api_key != expected:
+    if not api_key_matches(x_api_key):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API Key")
     return True
 
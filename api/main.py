@@ -5,9 +5,16 @@ from fastapi.security.api_key import APIKeyHeader
 from fastapi.openapi.utils import get_openapi
 from dotenv import load_dotenv
 import os
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ProcessPoolExecutor
 # add these imports near top of file
 from fastapi import FastAPI
 from starlette.responses import RedirectResponse
+from api.deps import FastJSONResponse
+from utils.notes_store import migrate_legacy_notes
+from utils.llm import get_llm
 
 
 
@@ -26,6 +33,8 @@ app = FastAPI(
     title="UNISOLE UPSC AI API",
     version="1.0.0",
     description="Backend API for UPSC AI News Platform",
+    # orjson for every JSON endpoint; stdlib json if orjson isn't installed
+    default_response_class=FastJSONResponse,
 )
 @app.get("/", include_in_schema=False)
 async def root_redirect():
@@ -75,12 +84,67 @@ def custom_openapi():
         }
     }
 
-    # Apply security globally
-    for path in openapi_schema["paths"].values():
-        for method in path.values():
-            method.setdefault("security", [{"APIKeyAuth": []}])
+    # Apply security globally (top-level default; operations can still override)
+    openapi_schema["security"] = [{"APIKeyAuth": []}]
 
     app.openapi_schema = openapi_schema
     return openapi_schema
 
 app.openapi = custom_openapi
+
+# ✅ Build the schema once at boot instead of on the first /docs hit
+@app.on_event("startup")
+def warm_openapi():
+    app.openapi()
+
+# ✅ Build the (lru-cached) LLM client at boot so the first request
+#    doesn't pay for client construction / provider imports
+@app.on_event("startup")
+def warm_llm():
+    try:
+        get_llm()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"LLM warmup skipped: {e}")
+
+# ✅ Process pool for CPU-bound scoring (PDF section relevance),
+#    split across gunicorn workers so N workers don't spawn N*cpu processes
+@app.on_event("startup")
+def start_score_pool():
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+    app.state.score_pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) // workers))
+
+@app.on_event("shutdown")
+def stop_score_pool():
+    pool = getattr(app.state, "score_pool", None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+# ✅ Split the old single saved_notes.json into per-date files (no-op once done)
+#    Every gunicorn worker runs this; day files are written under their flock
+#    by the first worker, the rest may race on renaming the legacy files and just log it.
+@app.on_event("startup")
+def migrate_notes():
+    try:
+        migrate_legacy_notes()
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Notes migration skipped: {e}")
+
+
+# ✅ Route root log records through a queue: handlers write from a listener
+#    thread, so logging never blocks the event loop on stdout/stderr
+@app.on_event("startup")
+def start_log_queue():
+    root = logging.getLogger()
+    if not root.handlers or any(isinstance(h, QueueHandler) for h in root.handlers):
+        return
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    app.state.log_listener = listener
+
+@app.on_event("shutdown")
+def stop_log_queue():
+    listener = getattr(app.state, "log_listener", None)
+    if listener is not None:
+        listener.stop()
@@ -1,37 +1,28 @@
 # api/routes/export.py
 from fastapi import APIRouter, HTTPException, Header, Query
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 import io
+import string
 import logging
 from typing import Optional
 from utils.docx_exporter import export_notes_to_docx, build_docx_from_notes
-from utils.config import DATA_DIR
-import os
-import json
+from utils.notes_store import get_day, notes_etag, etag_matches
+from api.deps import API_KEY_SET, api_key_matches
 
 router = APIRouter(prefix="/export", tags=["export"])
 
-# Path to saved notes
-SAVED_PATH = os.path.join(DATA_DIR, "saved_notes.json")
+# Filename allow-list; everything else (non-ASCII included) is dropped
+_SAFE_CHARS = set(string.ascii_letters + string.digits + " _-.")
+_UNSAFE_TABLE = str.maketrans("", "", "".join(chr(i) for i in range(128) if chr(i) not in _SAFE_CHARS))
 
-def load_saved_notes():
-    """Load saved notes from JSON file."""
-    if not os.path.exists(SAVED_PATH):
-        logging.warning(f"Saved notes file not found: {SAVED_PATH}")
-        return {}
-    
-    try:
-        with open(SAVED_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        logging.exception(f"Failed to parse saved_notes.json: {e}")
-        return {}
+def load_saved_notes(date: str):
+    """Load one date's saved notes (cached; shared store with /notes)."""
+    return get_day(date)
 
 
 def _validate_api_key(x_api_key: Optional[str] = Header(None)):
     """Validate API key if configured."""
-    expected = os.getenv("API_KEY")
-    if expected and x_api_key != expected:
+    if API_KEY_SET and not api_key_matches(x_api_key):
         raise HTTPException(status_code=401, detail="Invalid or missing API Key")
 
 
@@ -85,6 +76,7 @@ def export_docx_get(
     date: str,
     lang: str = Query("en", description="Language: en, hi, or both"),
     x_api_key: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Export saved notes for a specific date to DOCX format (GET method).
@@ -94,6 +86,7 @@ def export_docx_get(
         date: Date string (YYYY-MM-DD)
         lang: Language for summary (en/hi/both)
         x_api_key: API key for authentication
+        if_none_match: ETag from a previous download (304 if unchanged)
     
     Returns:
         StreamingResponse with DOCX file
@@ -103,12 +96,16 @@ def export_docx_get(
         _validate_api_key(x_api_key)
     except HTTPException:
         # Skip auth if no API_KEY is set
-        if os.getenv("API_KEY"):
+        if API_KEY_SET:
             raise
     
+    # Skip DOCX regeneration entirely if the client's copy is current
+    etag = notes_etag(date, "docx", lang)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     # Load saved notes
-    notes = load_saved_notes()
-    day_notes = notes.get(date)
+    day_notes = load_saved_notes(date)
     
     if not day_notes:
         logging.warning(f"No notes found for date: {date}")
@@ -117,6 +114,9 @@ def export_docx_get(
             detail=f"No notes found for date: {date}"
         )
     
+    # DOCX is saved straight into the buffer we stream back (no extra bytes copy)
+    stream = io.BytesIO()
+
     # Handle list format (from saved_notes.json)
     if isinstance(day_notes, list):
         logging.info(f"Converting list format ({len(day_notes)} items) to structured format")
@@ -124,11 +124,12 @@ def export_docx_get(
         structured = convert_list_to_structured_format(day_notes, date)
         
         try:
-            bytes_data = build_docx_from_notes(
+            build_docx_from_notes(
                 structured,
-                title=f"UPSC Notes - {date}"
+                title=f"UPSC Notes - {date}",
+                out_stream=stream,
             )
-            logging.info(f"DOCX generated successfully, size: {len(bytes_data)} bytes")
+            logging.info(f"DOCX generated successfully, size: {stream.tell()} bytes")
         except Exception as e:
             logging.exception(f"Export to DOCX failed: {e}")
             raise HTTPException(
@@ -141,13 +142,14 @@ def export_docx_get(
         logging.info(f"Using dict format for export")
         
         try:
-            bytes_data = export_notes_to_docx(
+            export_notes_to_docx(
                 day_notes,
                 cover=True,
                 language=lang,
-                cover_title=day_notes.get("title")
+                cover_title=day_notes.get("title"),
+                out_stream=stream,
             )
-            logging.info(f"DOCX generated successfully, size: {len(bytes_data)} bytes")
+            logging.info(f"DOCX generated successfully, size: {stream.tell()} bytes")
         except Exception as e:
             logging.exception(f"Export to DOCX failed: {e}")
             raise HTTPException(
@@ -164,16 +166,17 @@ def export_docx_get(
     
     # Generate safe filename
     safe_name = f"UPSC_Notes_{date}"
-    safe_name = "".join([c for c in safe_name if c.isalnum() or c in " _-."]).strip()
+    safe_name = safe_name.encode("ascii", "ignore").decode("ascii").translate(_UNSAFE_TABLE).strip()
     safe_name = safe_name or f"notes_{date}"
     
     if not safe_name.lower().endswith(".docx"):
         safe_name = safe_name + ".docx"
     
     # Return as streaming response
-    stream = io.BytesIO(bytes_data)
+    stream.seek(0)
     headers = {
-        "Content-Disposition": f"attachment; filename={safe_name}"
+        "Content-Disposition": f"attachment; filename={safe_name}",
+        "ETag": etag,
     }
     
     return StreamingResponse(
@@ -206,7 +209,7 @@ def export_docx_post(
         StreamingResponse with DOCX file
     """
     # Just redirect to GET method with same logic
-    return export_docx_get(date, lang=language, x_api_key=x_api_key)
+    return export_docx_get(date, lang=language, x_api_key=x_api_key, if_none_match=None)
 
 
 @router.get("/debug/{date}")
@@ -214,8 +217,7 @@ def debug_notes_structure(date: str):
     """
     Debug endpoint to check the structure of saved notes for a date.
     """
-    notes = load_saved_notes()
-    day_notes = notes.get(date)
+    day_notes = load_saved_notes(date)
     
     if not day_notes:
         return {"error": "No notes found for this date", "date": date}
@@ -1,60 +1,90 @@
 # api/routes/news.py
 # Ingest news -> UPSC structuring (deep) -> safe lists -> relevance -> ALWAYS return items
 
+import re
+import heapq
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from api.deps import verify_api_key
 from api.schemas import IngestRequest, IngestResponse, IngestItem
 
 from utils.news_fetcher import fetch_news
-from utils.categorizer import auto_categorize
+from utils.categorizer import auto_categorize_batch, _ensure_list
 from utils.relevance import score_relevance
 from utils.llm import get_llm
 
+try:
+    import ahocorasick  # pyahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
+# In-flight LLM calls per ingest request (calls are network-bound)
+_LLM_CONCURRENCY = 16
+
 # -----------------------
 # Safety / Cleaning utils
 # -----------------------
 
-def _ensure_list(value) -> List[str]:
-    """Normalize to list[str]; clean bullets & junk."""
-    if value is None:
-        return []
-    if isinstance(value, list):
-        out = []
-        for v in value:
-            if v is None:
-                continue
-            s = str(v).strip().strip("•- ").strip()
-            if s and any(c.isalnum() for c in s):
-                out.append(s)
-        return out
-    if isinstance(value, str):
-        parts = [p.strip().strip("•- ").strip() for p in value.split("\n")]
-        return [p for p in parts if p and any(c.isalnum() for c in p)]
-    return []
-
 def _str(x) -> str:
     return "" if x is None else str(x)
 
+_CATEGORY_RULES = [
+    ("polity",       ["parliament","constitution","bill","act","lok sabha","rajya sabha","supreme court","election"]),
+    ("economy",      ["gdp","inflation","rbi","budget","tax","fiscal","repo","bank","economy"]),
+    ("international",["foreign policy","un "," g20","fta","diplomacy","indo-pacific","bilateral","pakistan","china"]),
+    ("environment",  ["climate","wildlife","pollution","biodiversity","cyclone","emission","forest","conservation"]),
+    ("science_tech", ["isro","drdo","ai","quantum","space","research","semiconductor","technology","launch"]),
+    ("social",       ["health","education","welfare","poverty","tribal","social justice","women","child","nrega"]),
+    ("security",     ["defence","terrorism","border","army","navy","air force","internal security"]),
+    ("geography",    ["earthquake","flood","drought","monsoon","river","mountain"]),
+    ("governance",   ["niti aayog","e-governance","digital public infrastructure","sebi","regulator","implementation"]),
+]
+
+_RELEVANCE_KEYS = [
+    "india","government","policy","scheme","supreme court","rbi","budget","parliament",
+    "isro","environment","act","bill","election","gdp","inflation","security","governance"
+]
+
+def _build_automaton(payloads: Dict[str, int]):
+    """keyword -> int payload; one linear scan returns every (substring) hit."""
+    A = ahocorasick.Automaton()
+    for kw, val in payloads.items():
+        A.add_word(kw, val)
+    A.make_automaton()
+    return A
+
+if HAS_AHOCORASICK:
+    # payload = rule index; lowest index wins to keep the original rule priority
+    _cat_payloads: Dict[str, int] = {}
+    for _i, (_label, _keys) in enumerate(_CATEGORY_RULES):
+        for _k in _keys:
+            _cat_payloads.setdefault(_k, _i)
+    _CATEGORY_AC = _build_automaton(_cat_payloads)
+    _RELEVANCE_AC = _build_automaton({k: i for i, k in enumerate(_RELEVANCE_KEYS)})
+else:
+    # One capture group per rule inside a lookahead: every start position is
+    # tried (overlaps included) and m.lastindex - 1 is the matching rule index.
+    _CATEGORY_RE = re.compile("(?=" + "|".join(
+        "(%s)" % "|".join(map(re.escape, keys)) for _, keys in _CATEGORY_RULES
+    ) + ")")
+
 def _heuristic_category(text: str) -> str:
     t = (text or "").lower()
-    rules = [
-        ("polity",       ["parliament","constitution","bill","act","lok sabha","rajya sabha","supreme court","election"]),
-        ("economy",      ["gdp","inflation","rbi","budget","tax","fiscal","repo","bank","economy"]),
-        ("international",["foreign policy","un "," g20","fta","diplomacy","indo-pacific","bilateral","pakistan","china"]),
-        ("environment",  ["climate","wildlife","pollution","biodiversity","cyclone","emission","forest","conservation"]),
-        ("science_tech", ["isro","drdo","ai","quantum","space","research","semiconductor","technology","launch"]),
-        ("social",       ["health","education","welfare","poverty","tribal","social justice","women","child","nrega"]),
-        ("security",     ["defence","terrorism","border","army","navy","air force","internal security"]),
-        ("geography",    ["earthquake","flood","drought","monsoon","river","mountain"]),
-        ("governance",   ["niti aayog","e-governance","digital public infrastructure","sebi","regulator","implementation"]),
-    ]
-    for label, keys in rules:
-        if any(k in t for k in keys):
-            return label
-    return "general"
+    if HAS_AHOCORASICK:
+        best = min((idx for _, idx in _CATEGORY_AC.iter(t)), default=None)
+        return _CATEGORY_RULES[best][0] if best is not None else "general"
+    best = None
+    for m in _CATEGORY_RE.finditer(t):
+        idx = m.lastindex - 1
+        if best is None or idx < best:
+            best = idx
+            if best == 0:
+                break
+    return _CATEGORY_RULES[best][0] if best is not None else "general"
 
 def _fallback_points(title: str, desc: str, content: str) -> Dict[str, List[str]]:
     ctx = " ".join([title or "", desc or "", content or ""]).lower()
@@ -72,17 +102,16 @@ def _fallback_points(title: str, desc: str, content: str) -> Dict[str, List[str]
         "mains_angles": mains
     }
 
+# Compiled once; single alternation so each text is scanned in one pass.
+_DATE_RE = re.compile("|".join(f"(?:{p})" for p in [
+    r"\b(?:\d{4}-\d{2}-\d{2})\b",
+    r"\b(?:\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b",
+    r"\b(?:\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})\b",
+    r"\b(?:\d{1,2}/\d{1,2}/\d{2,4})\b",
+]))
+
 def _fallback_dates(text: str) -> List[str]:
-    import re
-    pats = [
-        r"\b(?:\d{4}-\d{2}-\d{2})\b",
-        r"\b(?:\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b",
-        r"\b(?:\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})\b",
-        r"\b(?:\d{1,2}/\d{1,2}/\d{2,4})\b",
-    ]
-    found = []
-    for p in pats:
-        found += re.findall(p, text or "")
+    found = _DATE_RE.findall(text or "")
     # dedupe keep order
     out, seen = [], set()
     for d in found:
@@ -92,12 +121,11 @@ def _fallback_dates(text: str) -> List[str]:
 
 def _keyword_relevance(text: str) -> int:
     """Simple fallback relevance 1-10 using keyword hits."""
-    keys = [
-        "india","government","policy","scheme","supreme court","rbi","budget","parliament",
-        "isro","environment","act","bill","election","gdp","inflation","security","governance"
-    ]
     t = (text or "").lower()
-    hits = sum(1 for k in keys if k in t)
+    if HAS_AHOCORASICK:
+        hits = len({idx for _, idx in _RELEVANCE_AC.iter(t)})
+    else:
+        hits = sum(1 for k in _RELEVANCE_KEYS if k in t)
     # map hits to 1..10
     score = 3 + min(7, hits)
     return max(1, min(10, score))
@@ -134,7 +162,7 @@ def _get_source_name(source_obj) -> str:
 # -----------------------
 
 @router.post("/news", response_model=IngestResponse)
-def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
+async def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
     """
     Fetch + structure UPSC news.
     Final Output Mode = A (always return items with safe fallbacks).
@@ -142,7 +170,8 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
     """
     # 1) Fetch raw items
     try:
-        articles: List[Dict[str, Any]] = fetch_news(
+        articles: List[Dict[str, Any]] = await run_in_threadpool(
+            fetch_news,
             query=req.query,
             days_back=req.days_back,
             page_size=req.page_size,
@@ -159,8 +188,13 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
     llm = get_llm()
     out: List[IngestItem] = []
 
-    # 2) Per-article: categorize + relevance + fallbacks
-    for art in articles:
+    # 2) AI deep structuring for all articles at once (concurrent LLM calls)
+    metas = await auto_categorize_batch(
+        articles, llm=llm, mode=(req.ai_mode or "deep"), concurrency=_LLM_CONCURRENCY
+    )
+
+    # 3) Per-article: relevance + fallbacks
+    for art, meta in zip(articles, metas):
         title = _str(art.get("title"))
         desc = _str(art.get("description"))
         content = _str(art.get("content"))
@@ -168,14 +202,7 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
         source=_get_source_name(art.get("source"))
 
 
-        # a) Try AI deep structuring
-        meta: Dict[str, Any] = {}
-        try:
-            meta = auto_categorize(article=art, llm=llm, mode=(req.ai_mode or "deep"))
-        except Exception:
-            meta = {}
-
-        # b) Clean & fallbacks (AI Clean Mode = A)
+        # a) Clean & fallbacks (AI Clean Mode = A)
         summary_en = _str(meta.get("summary_en")) or (title or desc or content[:300] or "Current affairs brief.")
         prelims = _ensure_list(meta.get("prelims_points"))
         mains = _ensure_list(meta.get("mains_angles"))
@@ -193,7 +220,7 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
 
         category = meta.get("category") or _heuristic_category(" ".join([title, desc, content]))
 
-        # c) Relevance (deep if chosen) with fallback keyword score
+        # b) Relevance (deep if chosen) with fallback keyword score
         rel_text = f"{title}\n{summary_en}\n{desc}\n{content}"
         try:
             rel_mode = "deep" if (req.ai_mode or "deep").lower() == "deep" else "fast"
@@ -203,7 +230,7 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
         except Exception:
             rel_score = _keyword_relevance(rel_text)
 
-        # d) Build schema-safe item
+        # c) Build schema-safe item
         item = IngestItem(
             title=title[:300],
             url=url,
@@ -222,10 +249,12 @@ def ingest_news(req: IngestRequest, _: bool = Depends(verify_api_key)):
         )
         out.append(item)
 
-    # 3) Sort & cap
-    out.sort(key=lambda x: int(getattr(x, "relevance", 0)), reverse=True)
+    # 4) Top-k by relevance (same order as sort+slice, O(N log k))
+    by_relevance = lambda x: int(getattr(x, "relevance", 0))
     if req.page_size and isinstance(req.page_size, int):
-        out = out[:max(1, req.page_size)]
+        out = heapq.nlargest(max(1, req.page_size), out, key=by_relevance)
+    else:
+        out.sort(key=by_relevance, reverse=True)
 
     print("DEBUG ingest output count =", len(out))
 
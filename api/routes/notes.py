@@ -1,54 +1,87 @@
 # api/routes/notes.py
-import os, json
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, List
-from api.deps import verify_api_key, SAVED_NOTES_PATH
-from api.schemas import SaveNoteRequest, NotesListResponse, IngestItem
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from typing import List, Literal, Optional
+from api.deps import verify_api_key
+from api.schemas import SaveNoteRequest, SaveNotesBulkRequest, NotesListResponse
+from utils.notes_store import aget_day, aapply_op, day_exists, note_matches, notes_alock, has_note, notes_etag, etag_matches
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
-def _load() -> Dict[str, List[dict]]:
-    if not os.path.exists(SAVED_NOTES_PATH):
-        return {}
-    try:
-        with open(SAVED_NOTES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+async def _load(date: str) -> List[dict]:
+    return await aget_day(date)
 
-def _save(data: Dict[str, List[dict]]):
-    with open(SAVED_NOTES_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+async def _apply(record: dict) -> None:
+    try:
+        await aapply_op(record)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/save")
-def save_note(req: SaveNoteRequest, _: bool = Depends(verify_api_key)):
-    data = _load()
-    data.setdefault(req.date, [])
-    exists = any((x.get("title")==req.title and x.get("url")==req.url) for x in data[req.date])
-    if exists:
-        return {"ok": True, "message": "Already saved"}
-    data[req.date].append(req.dict(exclude={"date"}))
-    _save(data)
+async def save_note(req: SaveNoteRequest, _: bool = Depends(verify_api_key)):
+    async with notes_alock:
+        await _load(req.date)
+        if has_note(req.date, req.title, req.url):
+            return {"ok": True, "message": "Already saved"}
+        await _apply({"op": "add", "date": req.date, "note": req.model_dump(mode="json", exclude={"date"})})
     return {"ok": True, "message": "Saved"}
 
-@router.get("/list/{date}", response_model=NotesListResponse)
-def list_notes(date: str, _: bool = Depends(verify_api_key)):
-    data = _load()
-    items = data.get(date, [])
-    # sort by relevance desc
-    items.sort(key=lambda x: int(x.get("relevance", 0)), reverse=True)
-    return NotesListResponse(date=date, items=[IngestItem(**it) for it in items])
+@router.post("/save_bulk")
+async def save_notes_bulk(req: SaveNotesBulkRequest, _: bool = Depends(verify_api_key)):
+    """Save many notes for one date with a single request and a single file write."""
+    async with notes_alock:
+        await _load(req.date)
+        new, seen = [], set()
+        for item in req.items:
+            key = (item.title, item.url)
+            if key in seen or has_note(req.date, item.title, item.url):
+                continue
+            seen.add(key)
+            new.append(item.model_dump(mode="json"))
+        if new:
+            await _apply({"op": "add_many", "date": req.date, "notes": new})
+    skipped = len(req.items) - len(new)
+    return {"ok": True, "saved": len(new), "skipped": skipped,
+            "message": f"Saved {len(new)}" + (f", {skipped} already saved" if skipped else "")}
+
+# Stored notes were validated by SaveNoteRequest on the way in, so they are
+# served as-is (app-wide ORJSONResponse); NotesListResponse is for the docs only.
+@router.get("/list/{date}", response_model=None, responses={200: {"model": NotesListResponse}})
+async def list_notes(
+    date: str,
+    response: Response,
+    category: Optional[str] = Query(None, description="Only notes in this category (case-insensitive)"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; all notes when omitted"),
+    offset: int = Query(0, ge=0),
+    sort: Literal["relevance", "recent"] = Query("relevance", description="relevance (desc) or recent (last saved first)"),
+    if_none_match: Optional[str] = Header(None),
+    _: bool = Depends(verify_api_key),
+):
+    etag = notes_etag(date, "list", (category or "").lower(), limit, offset, sort)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    items = await _load(date)
+    if category:
+        cat = category.lower()
+        items = [x for x in items if (x.get("category") or "general").lower() == cat]
+    if sort == "recent":
+        items = items[::-1]
+    else:
+        items = sorted(items, key=lambda x: int(x.get("relevance", 0)), reverse=True)
+    total = len(items)
+    items = items[offset:offset + limit] if limit is not None else items[offset:]
+    response.headers["ETag"] = etag
+    pages = -(-total // limit) if limit else int(total > 0)
+    return {"date": date, "total": total, "pages": pages, "items": items}
 
 @router.delete("/delete/{date}")
-def delete_day(date: str, _: bool = Depends(verify_api_key)):
-    data = _load()
-    if date in data:
-        del data[date]
-        _save(data)
-        return {"ok": True, "message": f"Deleted all notes for {date}"}
+async def delete_day(date: str, _: bool = Depends(verify_api_key)):
+    async with notes_alock:
+        if day_exists(date):
+            await _apply({"op": "delete_day", "date": date})
+            return {"ok": True, "message": f"Deleted all notes for {date}"}
     raise HTTPException(status_code=404, detail="Date not found")
 @router.post("/delete_one")
-def delete_one_note(payload: dict, _: bool = Depends(verify_api_key)):
+async def delete_one_note(payload: dict, _: bool = Depends(verify_api_key)):
     """
     payload = {
       "date": "YYYY-MM-DD",
@@ -61,29 +94,17 @@ def delete_one_note(payload: dict, _: bool = Depends(verify_api_key)):
     if not date:
         raise HTTPException(status_code=400, detail="date required")
 
-    data = _load()
-    items = data.get(date, [])
-    if not items:
-        raise HTTPException(status_code=404, detail="No notes for this date")
-
     title = payload.get("title")
     url = payload.get("url")
 
-    def keep(x):
-        # remove if both match; else try title/url match
-        if title and url:
-            return not (x.get("title") == title and x.get("url") == url)
-        if title:
-            return x.get("title") != title
-        if url:
-            return x.get("url") != url
-        return True  # nothing to remove
+    async with notes_alock:
+        items = await _load(date)
+        if not items:
+            raise HTTPException(status_code=404, detail="No notes for this date")
 
-    new_items = [x for x in items if keep(x)]
-    if len(new_items) == len(items):
-        raise HTTPException(status_code=404, detail="Note not found with given keys")
+        if not any(note_matches(x, title, url) for x in items):
+            raise HTTPException(status_code=404, detail="Note not found with given keys")
 
-    data[date] = new_items
-    _save(data)
+        await _apply({"op": "delete_one", "date": date, "title": title, "url": url})
     return {"ok": True, "message": "Note deleted"}
 
@@ -1,35 +1,112 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from utils.pdf_reader import extract_pdf_text_bytes, split_into_sections, summarize_sections_groq
+import asyncio
+import logging
+import tempfile
+from functools import lru_cache
+from typing import List
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from api.deps import FastJSONResponse, verify_api_key
+from utils.pdf_reader import (
+    extract_pdf_text_bytes, split_into_sections, split_pdf_into_sections, asummarize_sections_groq,
+    pdf_page_count,
+)
+from utils.relevance import score_texts_relevance
 
 router = APIRouter(prefix="/pdf")
+logger = logging.getLogger("news_tool.pdf")
+
+_READ_CHUNK = 1 << 20        # 1 MB reads from the upload
+_SPOOL_MAX_BYTES = 8 << 20   # keep small PDFs in RAM, spill bigger ones to disk
+_MAX_UPLOAD_BYTES = 50 << 20  # reject bigger uploads before parsing anything
+_MAX_PAGES = 1000
+_LOG_EVERY = 20  # repeats of one error: log the 1st, 21st, 41st... (~5%)
+
+@lru_cache(maxsize=256)
+def _error_counter(key: str) -> List[int]:
+    return [0]
+
+def _should_log(exc: Exception) -> bool:
+    """Rate-limit identical errors (e.g. during a provider outage)."""
+    counter = _error_counter(f"{type(exc).__name__}: {exc}")
+    counter[0] += 1
+    return counter[0] % _LOG_EVERY == 1
+
+def _extract_sections(spooled):
+    # 100 pages at a time, sectioned as we go; scanned/odd PDFs
+    # (nothing found) take the full extractor with its OCR fallback
+    sections = split_pdf_into_sections(spooled)
+    if not sections:
+        spooled.seek(0)
+        text, _, _ = extract_pdf_text_bytes(spooled)
+        sections = split_into_sections(text)
+    return sections
 
 @router.post("/analyze")
-async def analyze_pdf(file: UploadFile = File(...), mode: str = "deep"):
+async def analyze_pdf(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: str = "deep",
+    _: bool = Depends(verify_api_key),
+):
+    too_large = HTTPException(status_code=413, detail=f"PDF larger than {_MAX_UPLOAD_BYTES >> 20} MB")
     try:
-        content = await file.read()
+        declared = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        declared = 0
+    if declared > _MAX_UPLOAD_BYTES:
+        raise too_large
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+    try:
+        size = 0
+        while chunk := await file.read(_READ_CHUNK):
+            size += len(chunk)
+            if size > _MAX_UPLOAD_BYTES:
+                raise too_large
+            spooled.write(chunk)
+        spooled.seek(0)
+    except HTTPException:
+        spooled.close()
+        raise
     except Exception as e:
+        spooled.close()
         raise HTTPException(status_code=400, detail=f"File read failed: {e}")
 
+    # Page tree only, before any text extraction / LLM work
+    pages = await run_in_threadpool(pdf_page_count, spooled)
+    if pages is not None and pages > _MAX_PAGES:
+        spooled.close()
+        raise HTTPException(status_code=413, detail=f"PDF has {pages} pages (max {_MAX_PAGES})")
+
     try:
-        text = extract_pdf_text_bytes(content)
-        if not text or len(text.strip()) < 100:
-            return JSONResponse(
+        with spooled:
+            # Extraction is CPU-bound: keep it off the event loop
+            sections = await run_in_threadpool(_extract_sections, spooled)
+        if not sections:
+            return FastJSONResponse(
                 {"ok": False, "message": "No readable text found. (Try OCR or higher-quality scan)", "count": 0, "items": []},
                 status_code=200,
             )
 
-        sections = split_into_sections(text)
-        summaries = summarize_sections_groq(sections, mode=mode)
+        # LLM summaries (batches in flight concurrently) overlap with keyword scoring
+        texts = [s["text"] for s in sections]
+        pool = getattr(request.app.state, "score_pool", None)
+        summaries, scores = await asyncio.gather(
+            asummarize_sections_groq(sections, mode=mode),
+            asyncio.get_running_loop().run_in_executor(pool, score_texts_relevance, texts),
+        )
+        for item in summaries:
+            item["relevance"] = scores[item["index"]]
 
-        return {
+        # Plain str/int/float payload: hand it straight to orjson (no jsonable_encoder walk)
+        return FastJSONResponse({
             "ok": True,
             "count": len(summaries),
             "items": summaries,
             "message": f"Extracted {len(sections)} sections after cleaning."
-        }
+        })
 
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        if _should_log(e):
+            logger.exception("pdf analyze failed")
         raise HTTPException(status_code=500, detail=f"Internal error: {e}")
@@ -1,20 +1,74 @@
 # api/routes/rag.py
-from fastapi import APIRouter, Depends
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from api.deps import verify_api_key
 from api.schemas import RAGQueryRequest, RAGQueryResponse
-from utils.vector_store import get_vectorstore
+from utils.vector_store import get_vectorstore, index_version
 from utils.llm import get_llm
+from utils.llm_async import acomplete
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
-@router.post("/query", response_model=RAGQueryResponse)
-def rag_query(req: RAGQueryRequest, _: bool = Depends(verify_api_key)):
-    vs = get_vectorstore(req.index_date)
-    retriever = vs.as_retriever(search_kwargs={"k": req.k})
-    llm = get_llm()
-    docs = retriever.get_relevant_documents(req.question)
+# (index_date, k) -> (index version, retriever); opening the store per query
+# reloads the index. Build Index runs in another process, so each hit is
+# checked against the index files' mtime and reopened when they changed.
+_RETRIEVER_MAX = 32
+_retrievers: "OrderedDict[Tuple[str, int], Tuple[Optional[int], Any]]" = OrderedDict()
+_retrievers_lock = threading.Lock()
+
+def _retriever(index_date: str, k: int):
+    key = (index_date, k)
+    version = index_version(index_date)
+    with _retrievers_lock:
+        hit = _retrievers.get(key)
+        if hit is not None and hit[0] == version:
+            _retrievers.move_to_end(key)
+            return hit[1]
+    retriever = get_vectorstore(index_date).as_retriever(search_kwargs={"k": k})
+    with _retrievers_lock:
+        _retrievers[key] = (version, retriever)
+        _retrievers.move_to_end(key)
+        while len(_retrievers) > _RETRIEVER_MAX:
+            _retrievers.popitem(last=False)
+    return retriever
+
+async def _retrieve(retriever, question: str):
+    if hasattr(retriever, "ainvoke"):
+        return await retriever.ainvoke(question)
+    return await retriever.aget_relevant_documents(question)
+
+async def _answer(index_date: str, k: int, question: str) -> RAGQueryResponse:
+    # Cache misses open the vector store, which is blocking I/O
+    try:
+        retriever = await run_in_threadpool(_retriever, index_date, k)
+    except ValueError as e:  # not a safe date / collection name
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError:
+        if index_version(index_date) is None:
+            raise HTTPException(status_code=404, detail=f"No index built for {index_date}")
+        raise
+    docs = await _retrieve(retriever, question)
     context = "\n\n".join(d.page_content for d in docs)
-    prompt = f"Use the context to answer concisely for UPSC:\n\nContext:\n{context}\n\nQuestion: {req.question}\n\nAnswer:"
-    answer = llm.invoke(prompt).content
+    prompt = f"Use the context to answer concisely for UPSC:\n\nContext:\n{context}\n\nQuestion: {question}\n\nAnswer:"
+    answer = await acomplete(prompt, get_llm())
     sources = [{"metadata": d.metadata} for d in docs]
     return RAGQueryResponse(answer=answer, sources=sources)
+
+# Identical questions arriving while one is in flight share its answer
+_inflight: Dict[Tuple[str, int, str], "asyncio.Future"] = {}
+
+@router.post("/query", response_model=RAGQueryResponse)
+async def rag_query(req: RAGQueryRequest, _: bool = Depends(verify_api_key)):
+    key = (req.index_date, req.k, req.question)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_answer(*key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    # shield: one client disconnecting must not cancel the others' answer
+    return await asyncio.shield(task)
@@ -1,8 +1,13 @@
 # api/schemas.py
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+
+# Requests reject unknown fields; items are immutable (and hashable, hence the
+# tuple list-fields). Response wrappers keep ignoring extras.
+_STRICT = ConfigDict(extra="forbid", frozen=True)
 
 class IngestRequest(BaseModel):
+    model_config = _STRICT
     query: str
     days_back: int = 2
     use_newsapi: bool = True
@@ -13,6 +18,7 @@ class IngestRequest(BaseModel):
 
 
 class IngestItem(BaseModel):
+    model_config = _STRICT
     title: str
     url: Optional[str] = None
     publishedAt: Optional[str] = None
@@ -21,22 +27,31 @@ class IngestItem(BaseModel):
     relevance: int = 0
     summary_en: Optional[str] = None
     summary_hi: Optional[str] = None
-    prelims_points: Optional[List[str]] = None
-    mains_angles: Optional[List[str]] = None
-    interview_questions: Optional[List[str]] = None
-    schemes_acts_policies: Optional[List[str]] = None
-    institutions: Optional[List[str]] = None
-    dates: Optional[List[str]] = None
+    prelims_points: Optional[Tuple[str, ...]] = None
+    mains_angles: Optional[Tuple[str, ...]] = None
+    interview_questions: Optional[Tuple[str, ...]] = None
+    schemes_acts_policies: Optional[Tuple[str, ...]] = None
+    institutions: Optional[Tuple[str, ...]] = None
+    dates: Optional[Tuple[str, ...]] = None
 
 class IngestResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     count: int
     items: List[IngestItem]
 
 class SaveNoteRequest(IngestItem):
     date: str
 
+class SaveNotesBulkRequest(BaseModel):
+    model_config = _STRICT
+    date: str
+    items: Tuple[IngestItem, ...] = Field(..., min_length=1, max_length=200)
+
 class NotesListResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     date: str
+    total: int
+    pages: int
     items: List[IngestItem]
 
 class PDFAnalyzeRequest(BaseModel):
@@ -49,10 +64,12 @@ class PDFAnalyzeResponse(BaseModel):
     # optional: you can add export urls or ids
 
 class RAGQueryRequest(BaseModel):
+    model_config = _STRICT
     index_date: str
     question: str
     k: int = 4
 
 class RAGQueryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     answer: str
     sources: List[Dict[str, Any]] = []
@@ -1,6 +1,8 @@
 import streamlit as st
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
 import json
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.prompts import PromptTemplate
@@ -12,12 +14,52 @@ from langchain.embeddings import OpenAIEmbeddings
 from langchain.chains import RetrievalQA
 import re
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 import PyPDF2
 import io
+import hashlib
+import pathlib
+from types import MappingProxyType
+import numpy as np
+import asyncio
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
+from utils.ui_components import DEFERRED_DOWNLOAD_DATA  # Streamlit >= 1.52: lazy download_button data
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+    HAS_EMBEDDING_STORE = True
+except ImportError:
+    HAS_EMBEDDING_STORE = False
+
+# On-disk caches: whole knowledge bases by content hash, single embeddings by text
+FAISS_CACHE_DIR = os.getenv("FAISS_CACHE_DIR", os.path.join("data", "cache", "faiss"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join("data", "cache", "embeddings"))
+
+# UPSC-relevant categories -> NewsAPI query (read-only, built once per process)
+UPSC_CATEGORIES = MappingProxyType({
+    'polity': 'India AND (government OR politics OR parliament OR constitution OR supreme court OR election)',
+    'economy': 'India AND (economy OR budget OR GDP OR inflation OR RBI OR finance OR tax)',
+    'international': 'India AND (international OR foreign policy OR diplomacy OR trade OR china OR pakistan)',
+    'environment': 'India AND (environment OR climate OR pollution OR forest OR wildlife OR renewable)',
+    'science_tech': 'India AND (science OR technology OR space OR ISRO OR research OR innovation)',
+    'social': 'India AND (education OR health OR welfare OR scheme OR poverty OR rural development)',
+    'security': 'India AND (security OR defence OR military OR terrorism OR border OR army)',
+    'geography': 'India AND (disaster OR flood OR earthquake OR cyclone OR drought OR weather)'
+})
+
 # Page configuration
 st.set_page_config(
     page_title="UPSC Daily News Analyzer",
@@ -26,79 +68,99 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better UI
-st.markdown("""
-<style>
-.main-header {
-    font-size: 2.5rem;
-    color: #1f77b4;
-    text-align: center;
-    margin-bottom: 2rem;
-    text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-}
-.category-header {
-    font-size: 1.5rem;
-    color: #ff7f0e;
-    border-bottom: 2px solid #ff7f0e;
-    padding-bottom: 0.5rem;
-    margin: 1rem 0;
-}
-.article-card {
-    background-color: #f8f9fa;
-    padding: 1rem;
-    border-radius: 0.5rem;
-    margin: 1rem 0;
-    border-left: 4px solid #1f77b4;
-}
-.upsc-summary {
-    background-color: #e8f5e8;
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    border-left: 4px solid #28a745;
-    margin: 1rem 0;
-}
-.key-points {
-    background-color: #fff3cd;
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    border-left: 4px solid #ffc107;
-    margin: 1rem 0;
-}
-.important-dates {
-    background-color: #d1ecf1;
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    border-left: 4px solid #17a2b8;
-    margin: 1rem 0;
-}
-.laws-acts {
-    background-color: #f8d7da;
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    border-left: 4px solid #dc3545;
-    margin: 1rem 0;
-}
-.chat-container {
-    background-color: #f1f3f4;
-    padding: 1rem;
-    border-radius: 0.5rem;
-    margin: 0.5rem 0;
-}
-.user-message {
-    background-color: #e3f2fd;
-    padding: 0.8rem;
-    border-radius: 1rem;
-    margin: 0.5rem 0;
-    text-align: right;
-}
-.bot-message {
-    background-color: #f1f8e9;
-    padding: 0.8rem;
-    border-radius: 1rem;
-    margin: 0.5rem 0;
-}
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for better UI (read from assets/style.css once per process;
+# Streamlit needs the <style> element emitted on every run)
+@st.cache_resource
+def _load_css() -> str:
+    return f"<style>\n{pathlib.Path(__file__).with_name('assets').joinpath('style.css').read_text(encoding='utf-8')}</style>"
+
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+@st.cache_resource
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """One event loop per process on a daemon thread; the LLM's async HTTP client binds to it"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="newstool-async", daemon=True).start()
+    return loop
+
+def _run_async(coro):
+    """Run coro on the shared background loop and wait for it (asyncio.run() would
+    create and close a loop per call, stranding clients bound to the previous one)"""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NEWSAPI_TRUNCATION_RE = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+
+def _clean_field(value) -> str:
+    return _WHITESPACE_RE.sub(" ", str(value or "")).strip()
+
+def _prep_article_text(article: Dict, max_chars: int = 1500) -> str:
+    """Compact LLM input: whitespace-normalized fields, NewsAPI's '[+N chars]' tail dropped, body capped"""
+    title = _clean_field(article.get('title'))
+    description = _clean_field(article.get('description'))
+    content = _NEWSAPI_TRUNCATION_RE.sub("", _clean_field(article.get('content')))
+    # NewsAPI content often just repeats the description
+    if description and content.startswith(description):
+        content = content[len(description):].strip()
+    source = _clean_field((article.get('source') or {}).get('name'))
+    
+    header = f"Title: {title}\nSource: {source}\nPublished: {_clean_field(article.get('publishedAt'))}\nText: "
+    body = " ".join(part for part in (description, content) if part)
+    budget = max(0, max_chars - len(header))
+    if len(body) > budget:
+        body = body[:budget].rsplit(" ", 1)[0]
+    return header + body
+
+class _VectorIndex:
+    """
+    Growable (N, dim) float32 matrix of L2-normalized vectors plus their answers.
+    Capacity doubles, so adding is amortized O(dim) (no vstack copy per insert),
+    and a lookup is one BLAS matvec over the filled rows.
+    """
+    
+    def __init__(self):
+        self.matrix = None
+        self.size = 0
+        self.answers: List[str] = []
+    
+    def add(self, vec: np.ndarray, answer: str) -> None:
+        if self.matrix is None:
+            self.matrix = np.empty((16, vec.shape[0]), dtype=np.float32)
+        elif self.size == self.matrix.shape[0]:
+            grown = np.empty((self.size * 2, self.matrix.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.matrix
+            self.matrix = grown
+        self.matrix[self.size] = vec
+        self.size += 1
+        self.answers.append(answer)
+    
+    def best(self, vec: np.ndarray):
+        """(cosine, answer) of the closest stored vector, or (-1.0, None) if empty"""
+        if not self.size:
+            return -1.0, None
+        sims = self.matrix[:self.size] @ vec
+        i = int(np.argmax(sims))
+        return float(sims[i]), self.answers[i]
+
+@st.cache_resource
+def _get_text_splitter(chunk_size: int = 2000, chunk_overlap: int = 200):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len
+    )
+
+# Extraction and splitting are pure functions of the content: cache them by its
+# sha256 (underscore args are not hashed again by Streamlit)
+@st.cache_data(show_spinner=False, max_entries=32)
+def _pdf_text_cached(digest: str, _pdf_bytes: bytes) -> str:
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(_pdf_bytes))
+    # One join instead of repeated +=; image-only pages return None/""
+    return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _split_text_cached(digest: str, _text: str, chunk_size: int = 2000, chunk_overlap: int = 200) -> List[str]:
+    return _get_text_splitter(chunk_size, chunk_overlap).split_text(_text)
 
 class UPSCNewsAnalyzer:
     def __init__(self, newsapi_key: str, openai_key: str = None):
@@ -106,32 +168,97 @@ class UPSCNewsAnalyzer:
         self.openai_key = openai_key
         self.base_url = "https://newsapi.org/v2/everything"
         
+        # Keep-alive HTTP session, shared by reruns and fetch threads (the analyzer is
+        # cached per key pair by get_analyzer, so per-user state stays in st.session_state)
+        self.session = self._build_session()
+        
         # Initialize LangChain components
         if openai_key:
             self.llm = OpenAI(temperature=0.3, openai_api_key=openai_key, max_tokens=1000)
-            self.embeddings = OpenAIEmbeddings(openai_api_key=openai_key)
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=2000,
-                chunk_overlap=200,
-                length_function=len
-            )
+            # Up to 1000 texts per embeddings POST
+            self.embeddings = OpenAIEmbeddings(openai_api_key=openai_key, chunk_size=1000, max_retries=3)
+            # Document embeddings memoized per text, so overlapping article sets only embed the new ones
+            self.doc_embeddings = self.embeddings
+            if HAS_EMBEDDING_STORE:
+                try:
+                    self.doc_embeddings = CacheBackedEmbeddings.from_bytes_store(
+                        self.embeddings, LocalFileStore(EMBEDDING_CACHE_DIR), namespace="openai"
+                    )
+                except Exception:
+                    pass
+            self.text_splitter = _get_text_splitter()
             self._setup_prompts()
         
-        # UPSC-relevant categories
-        self.upsc_categories = {
-            'polity': 'India AND (government OR politics OR parliament OR constitution OR supreme court OR election)',
-            'economy': 'India AND (economy OR budget OR GDP OR inflation OR RBI OR finance OR tax)',
-            'international': 'India AND (international OR foreign policy OR diplomacy OR trade OR china OR pakistan)',
-            'environment': 'India AND (environment OR climate OR pollution OR forest OR wildlife OR renewable)',
-            'science_tech': 'India AND (science OR technology OR space OR ISRO OR research OR innovation)',
-            'social': 'India AND (education OR health OR welfare OR scheme OR poverty OR rural development)',
-            'security': 'India AND (security OR defence OR military OR terrorism OR border OR army)',
-            'geography': 'India AND (disaster OR flood OR earthquake OR cyclone OR drought OR weather)'
-        }
+        # UPSC-relevant categories (module constant, shared read-only)
+        self.upsc_categories = UPSC_CATEGORIES
+
+    
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """Pooled session: one TCP+TLS handshake per host instead of per request"""
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry))
+        return session
+    
+    SEMANTIC_CACHE_THRESHOLD = 0.95
+    
+    @staticmethod
+    def _llm_cache() -> Dict:
+        """This user's LLM response cache (survives reruns): exact hits by hash, near-duplicates by embedding"""
+        return st.session_state.setdefault('llm_cache', {'exact': {}, 'semantic': {}})
+    
+    def _cache_lookup(self, kind: str, prompt_vars: Dict):
+        """(key, embedding, cached answer or None) for these prompt variables"""
+        return self._cache_lookup_many(kind, [prompt_vars])[0]
+    
+    def _cache_lookup_many(self, kind: str, prompt_vars_list: List[Dict]) -> List[tuple]:
+        """
+        _cache_lookup() for a batch: exact hits first, then one embed_documents call
+        for all the misses. Chat kinds are exact-only, since a near-identical question
+        ("repo rate" vs "reverse repo rate") can need a different answer.
+        """
+        cache = self._llm_cache()
+        results, pending = [], []
+        for i, prompt_vars in enumerate(prompt_vars_list):
+            text = "\n".join(str(prompt_vars[k]) for k in sorted(prompt_vars))
+            key = hashlib.sha1(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+            results.append((key, None, cache['exact'].get(key)))
+            if key not in cache['exact']:
+                pending.append((i, text))
+        if not pending or kind.startswith("chat:"):
+            return results
         
-        # Initialize knowledge base
-        if 'knowledge_base' not in st.session_state:
-            st.session_state.knowledge_base = None
+        # Only the variable part is embedded; the shared template would make every prompt look alike
+        try:
+            vecs = np.asarray(self.embeddings.embed_documents([text for _, text in pending]), dtype=np.float32)
+        except Exception:
+            return results
+        vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        index = cache['semantic'].get(kind)
+        for (i, _), vec in zip(pending, vecs):
+            key, answer = results[i][0], None
+            if index is not None:
+                score, best = index.best(vec)
+                if score >= self.SEMANTIC_CACHE_THRESHOLD:
+                    cache['exact'][key] = answer = best
+            results[i] = (key, vec, answer)
+        return results
+    
+    def _cache_store(self, kind: str, key: str, vec, result: str) -> None:
+        cache = self._llm_cache()
+        cache['exact'][key] = result
+        if vec is not None:
+            cache['semantic'].setdefault(kind, _VectorIndex()).add(vec, result)
+    
+    def _cached_run(self, kind: str, run, **prompt_vars) -> str:
+        """Return run() for these prompt variables, reusing an exact or (except for chat) near-duplicate earlier answer"""
+        key, vec, hit = self._cache_lookup(kind, prompt_vars)
+        if hit is not None:
+            return hit
+        result = run()
+        self._cache_store(kind, key, vec, result)
+        return result
     
     def _setup_prompts(self):
         """Setup LangChain prompts for UPSC analysis"""
@@ -235,40 +362,89 @@ Guidelines for your response:
 Answer:
 """
         )
+        
+        # Chains are built once per analyzer and reused by every call
+        self.enhanced_chain = LLMChain(llm=self.llm, prompt=self.enhanced_analysis_prompt)
+        self.pdf_chain = LLMChain(llm=self.llm, prompt=self.pdf_analysis_prompt)
+        self.simple_chain = LLMChain(llm=self.llm, prompt=PromptTemplate(
+            input_variables=["question"],
+            template="You are a UPSC mentor. Answer this question with focus on exam preparation: {question}"
+        ))
+        
+        # Several articles per call: same per-article format, one shared instruction prefix.
+        # max_tokens=-1 lets the completion use whatever context the prompt leaves.
+        template = self.enhanced_analysis_prompt.template
+        analysis_format = template[template.index("## 🎯 KEY BULLET POINTS:"):]
+        self.batch_analysis_prompt = PromptTemplate(
+            input_variables=["articles_block", "category"],
+            template="""
+You are an expert UPSC mentor and current affairs analyst. Analyze EACH of the following news articles for UPSC preparation.
+
+ARTICLE CATEGORY: {category}
+
+{articles_block}
+
+For EACH article, in order, first write a line "## ARTICLE <number>" and then its analysis in this EXACT format:
+
+""" + analysis_format.replace("{", "{{").replace("}", "}}")
+        )
+        self.batch_llm = OpenAI(temperature=0.3, openai_api_key=self.openai_key, max_tokens=-1)
+        self.batch_chain = LLMChain(llm=self.batch_llm, prompt=self.batch_analysis_prompt)
     
     def extract_pdf_text(self, pdf_file):
         """Extract text from uploaded PDF"""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+            pdf_bytes = pdf_file.getvalue() if hasattr(pdf_file, "getvalue") else pdf_file.read()
+            return _pdf_text_cached(hashlib.sha256(pdf_bytes).hexdigest(), pdf_bytes)
         except Exception as e:
             st.error(f"Error reading PDF: {str(e)}")
             return None
     
+    PDF_MAX_CHUNKS = 3
+    PDF_CONCURRENCY = 4
+    
     def analyze_pdf_content(self, pdf_text: str, user_query: str = "Provide a UPSC-focused summary") -> str:
         """Analyze PDF content based on user query"""
         if not self.openai_key:
             return "PDF analysis requires OpenAI API key. Please add it in the sidebar."
         
         try:
-            # Split text if too long
-            docs = self.text_splitter.create_documents([pdf_text])
+            # Split text if too long (cached per text, so a new query reuses the chunks)
+            chunks = _split_text_cached(hashlib.sha256(pdf_text.encode("utf-8")).hexdigest(), pdf_text)
             
             # Analyze with LLM
-            chain = LLMChain(llm=self.llm, prompt=self.pdf_analysis_prompt)
+            chain = self.pdf_chain
             
-            if len(docs) == 1:
-                analysis = chain.run(pdf_text=docs[0].page_content, user_query=user_query)
+            if len(chunks) == 1:
+                prompt_vars = dict(pdf_text=chunks[0], user_query=user_query)
+                analysis = self._cached_run("pdf", lambda: chain.run(**prompt_vars), **prompt_vars)
             else:
-                # For multiple chunks, analyze each and combine
-                analyses = []
-                for i, doc in enumerate(docs[:3]):  # Limit to first 3 chunks
-                    chunk_analysis = chain.run(pdf_text=doc.page_content, user_query=f"{user_query} (Part {i+1})")
-                    analyses.append(f"**Part {i+1}:**\n{chunk_analysis}")
-                analysis = "\n\n".join(analyses)
+                # For multiple chunks, analyze each (uncached ones concurrently) and combine
+                parts = [
+                    dict(pdf_text=chunk, user_query=f"{user_query} (Part {i+1})")
+                    for i, chunk in enumerate(chunks[:self.PDF_MAX_CHUNKS])
+                ]
+                lookups = self._cache_lookup_many("pdf", parts)
+                # Shortest first, so a long chunk doesn't hold back a wave of short ones
+                misses = sorted((i for i, (_, _, hit) in enumerate(lookups) if hit is None),
+                                key=lambda i: len(parts[i]["pdf_text"]))
+                
+                async def _run_chunks():
+                    semaphore = asyncio.Semaphore(self.PDF_CONCURRENCY)
+                    
+                    async def _one(i):
+                        async with semaphore:
+                            return await chain.arun(**parts[i])
+                    
+                    return await asyncio.gather(*[_one(i) for i in misses])
+                
+                # Original part order is kept for the report via the index
+                results = {i: hit for i, (_, _, hit) in enumerate(lookups) if hit is not None}
+                for i, result in zip(misses, _run_async(_run_chunks()) if misses else []):
+                    key, vec, _ = lookups[i]
+                    self._cache_store("pdf", key, vec, result)
+                    results[i] = result
+                analysis = "\n\n".join(f"**Part {i+1}:**\n{results[i]}" for i in range(len(parts)))
             
             return analysis
             
@@ -276,13 +452,16 @@ Answer:
             return f"Error analyzing PDF: {str(e)}"
     
     def create_knowledge_base(self, articles: List[Dict]):
-        """Create a vector knowledge base from articles for chatbot"""
+        """
+        Create a vector knowledge base from articles for chatbot.
+        The store carries `content_key` (sha1 of its texts) so answers can be cached per news set.
+        """
         if not self.openai_key:
             return None
         
         try:
-            # Prepare documents
-            documents = []
+            # Prepare texts
+            texts = []
             for article in articles:
                 content = f"""
                 Title: {article.get('title', '')}
@@ -292,11 +471,27 @@ Answer:
                 Description: {article.get('description', '')}
                 Content: {article.get('content', '')}
                 """
-                documents.append(Document(page_content=content))
+                texts.append(content)
             
-            # Create vector store
-            if documents:
-                vectorstore = FAISS.from_documents(documents, self.embeddings)
+            # Create vector store: length-sorted texts pack into evenly sized embedding batches
+            if texts:
+                texts.sort(key=len)
+                key = hashlib.sha1("\0".join(["l2", *sorted(texts)]).encode("utf-8")).hexdigest()
+                path = os.path.join(FAISS_CACHE_DIR, key)
+                vectorstore = None
+                if os.path.isdir(path):
+                    try:
+                        vectorstore = self._load_faiss(path)
+                    except Exception:
+                        pass  # unreadable cache entry: rebuild it
+                if vectorstore is None:
+                    # Unit vectors, so MMR's similarity/diversity trade-off works on cosine
+                    vectorstore = FAISS.from_texts(texts, self.doc_embeddings, normalize_L2=True)
+                    try:
+                        vectorstore.save_local(path)
+                    except Exception:
+                        pass
+                vectorstore.content_key = key
                 return vectorstore
             
         except Exception as e:
@@ -304,87 +499,138 @@ Answer:
         
         return None
     
+    def _load_faiss(self, path: str):
+        """Load a knowledge base this app saved itself (pickled docstore)"""
+        try:
+            return FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True, normalize_L2=True)
+        except TypeError:  # older langchain: no opt-in flag
+            return FAISS.load_local(path, self.embeddings, normalize_L2=True)
+    
     def chat_with_news(self, question: str, knowledge_base) -> str:
         """Chat with the news knowledge base"""
         if not self.openai_key or not knowledge_base:
             return "Chat feature requires OpenAI API key and news data. Please fetch news first."
         
         try:
-            # Create retrieval chain
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=knowledge_base.as_retriever(search_kwargs={"k": 3}),
-                chain_type_kwargs={"prompt": self.chatbot_prompt}
-            )
+            # Retrieval chain, rebuilt only when this user's knowledge base changes.
+            # Kept in session_state: the analyzer itself is shared by every session.
+            kb_key, qa_chain = st.session_state.get('qa_chain', (None, None))
+            if kb_key != knowledge_base.content_key:
+                qa_chain = RetrievalQA.from_chain_type(
+                    llm=self.llm,
+                    chain_type="stuff",
+                    # MMR: 4 diverse chunks out of the 20 closest, not 3 near-duplicates of one story
+                    retriever=knowledge_base.as_retriever(
+                        search_type="mmr",
+                        search_kwargs={"k": 4, "fetch_k": 20, "lambda_mult": 0.5},
+                    ),
+                    chain_type_kwargs={"prompt": self.chatbot_prompt}
+                )
+                st.session_state.qa_chain = (knowledge_base.content_key, qa_chain)
             
-            response = qa_chain.run(question)
+            # Answers depend on the indexed news, so cache per knowledge base content
+            # (id() can be reused by the next knowledge base once the old one is freed)
+            response = self._cached_run(f"chat:{knowledge_base.content_key}", lambda: qa_chain.run(question), question=question)
             return response
             
         except Exception as e:
             return f"Error in chat: {str(e)}"
     
-    def fetch_news_by_category(self, category: str, days_back: int = 3, max_articles: int = 10) -> List[Dict]:
-        """Fetch news articles for a specific UPSC category"""
-        try:
-            query = self.upsc_categories.get(category, f'India AND {category}')
-            
-            end_date = datetime.today()
-            start_date = end_date - timedelta(days=days_back)
-            
-            params = {
-                'q': query,
-                'from': start_date.strftime('%Y-%m-%d'),
-                'to': end_date.strftime('%Y-%m-%d'),
-                'sortBy': 'publishedAt',
-                'pageSize': max_articles * 2,
-                'language': 'en',
-                'apiKey': self.newsapi_key
-            }
-            
-            response = requests.get(self.base_url, params=params)
-            
-            if response.status_code != 200:
-                return []
-            
-            data = response.json()
-            
-            if data.get("status") != "ok":
-                return []
-            
-            articles = data.get("articles", [])
-            filtered_articles = self._filter_indian_articles(articles)[:max_articles]
-            
-            # Add category info to articles
-            for article in filtered_articles:
-                article['category'] = category
-            
-            return filtered_articles
-            
-        except Exception as e:
-            st.error(f"Error fetching {category} news: {str(e)}")
-            return []
+    def fetch_news_by_category(self, category: str, days_back: int = 3, max_articles: int = 10) -> Optional[List[Dict]]:
+        """Fetch news articles for a specific UPSC category (reused for 30 minutes); None on failure"""
+        return self.fetch_news_for_categories([category], days_back, max_articles).get(category)
+    
+    def fetch_news_for_categories(self, categories: List[str], days_back: int = 3, max_articles: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Fetch several categories at once (one NewsAPI request in flight per uncached
+        category), reusing results for 30 minutes. Failed categories are left out so
+        they can be retried.
+        """
+        if not categories:
+            return {}
+        cache_args = (days_back, max_articles, datetime.now(timezone.utc).strftime('%Y%m%d%H'))
+        results, misses = {}, []
+        for category in categories:
+            try:
+                results[category] = _fetch_news_cached(self.newsapi_key, category, *cache_args)
+            except _NewsCacheMiss:
+                misses.append(category)
+        
+        if misses:
+            # Workers only do HTTP; st.* calls (the cache included) stay on the script thread
+            with ThreadPoolExecutor(max_workers=len(misses)) as executor:
+                futures = {
+                    cat: executor.submit(self._fetch_category, cat, days_back, max_articles)
+                    for cat in misses
+                }
+            for category, future in futures.items():
+                try:
+                    results[category] = _fetch_news_cached(
+                        self.newsapi_key, category, *cache_args, _articles=future.result()
+                    )
+                except Exception as e:
+                    st.error(f"Error fetching {category} news: {str(e)}")
+        return {cat: results[cat] for cat in categories if cat in results}
+    
+    def _fetch_category(self, category: str, days_back: int, max_articles: int) -> List[Dict]:
+        """NewsAPI request + India filter for one category; raises on network errors and API errors (e.g. 429)"""
+        query = UPSC_CATEGORIES.get(category, f'India AND {category}')
+        
+        end_date = datetime.today()
+        start_date = end_date - timedelta(days=days_back)
+        
+        params = {
+            'q': query,
+            'from': start_date.strftime('%Y-%m-%d'),
+            'to': end_date.strftime('%Y-%m-%d'),
+            'sortBy': 'publishedAt',
+            'pageSize': max_articles * 2,
+            'language': 'en',
+            'apiKey': self.newsapi_key
+        }
+        
+        response = self.session.get(self.base_url, params=params, timeout=10)
+        
+        if response.status_code != 200:
+            raise RuntimeError(f"NewsAPI returned HTTP {response.status_code}")
+        
+        # orjson parses the raw bytes directly (NewsAPI pages can be 100 KB+)
+        data = orjson.loads(response.content) if HAS_ORJSON else response.json()
+        
+        if data.get("status") != "ok":
+            raise RuntimeError(f"NewsAPI error: {data.get('message') or data.get('code') or 'unknown'}")
+        
+        articles = data.get("articles", [])
+        filtered_articles = self._filter_indian_articles(articles)[:max_articles]
+        
+        # Add category info to articles
+        for article in filtered_articles:
+            article['category'] = category
+        
+        return filtered_articles
+    
+    INDIA_KEYWORDS = (
+        'india', 'indian', 'delhi', 'mumbai', 'bangalore', 'kolkata', 'chennai',
+        'modi', 'parliament', 'lok sabha', 'rajya sabha', 'bjp', 'congress',
+        'hindustan', 'bharat', 'new delhi', 'maharashtra', 'gujarat', 'karnataka',
+        'supreme court', 'high court', 'rbi', 'sebi', 'niti aayog'
+    )
     
     def _filter_indian_articles(self, articles: List[Dict]) -> List[Dict]:
         """Filter articles to ensure they're India-related"""
-        india_keywords = [
-            'india', 'indian', 'delhi', 'mumbai', 'bangalore', 'kolkata', 'chennai',
-            'modi', 'parliament', 'lok sabha', 'rajya sabha', 'bjp', 'congress',
-            'hindustan', 'bharat', 'new delhi', 'maharashtra', 'gujarat', 'karnataka',
-            'supreme court', 'high court', 'rbi', 'sebi', 'niti aayog'
-        ]
-        
         filtered = []
         for article in articles:
-            title = article.get("title", "").lower()
-            description = article.get("description", "").lower()
-            content = article.get("content", "").lower()
-            source = article.get("source", {}).get("name", "").lower()
+            text_to_check = " ".join((
+                article.get("title") or "",
+                article.get("description") or "",
+                article.get("content") or "",
+                (article.get("source") or {}).get("name") or "",
+            )).lower()
             
-            text_to_check = f"{title} {description} {content} {source}"
-            
-            if any(keyword in text_to_check for keyword in india_keywords):
-                article['upsc_relevance'] = sum(1 for keyword in india_keywords if keyword in text_to_check)
+            # One lower() and one counting pass (a keyword hit implies India-related)
+            score = sum(keyword in text_to_check for keyword in self.INDIA_KEYWORDS)
+            if score:
+                article['upsc_relevance'] = score
                 filtered.append(article)
         
         filtered.sort(key=lambda x: x.get('upsc_relevance', 0), reverse=True)
@@ -396,16 +642,14 @@ Answer:
             return self._create_basic_analysis(article, category)
         
         try:
-            article_text = f"""
-            Title: {article.get('title', '')}
-            Description: {article.get('description', '')}
-            Content: {article.get('content', '')}
-            Source: {article.get('source', {}).get('name', '')}
-            Published: {article.get('publishedAt', '')}
-            """
+            article_text = _prep_article_text(article)
             
-            chain = LLMChain(llm=self.llm, prompt=self.enhanced_analysis_prompt)
-            analysis = chain.run(article_text=article_text, category=category)
+            chain = self.enhanced_chain
+            analysis = self._cached_run(
+                f"article:{category}",
+                lambda: chain.run(article_text=article_text, category=category),
+                article_text=article_text, category=category,
+            )
             
             return {
                 'analysis': analysis,
@@ -418,6 +662,62 @@ Answer:
             st.error(f"Analysis error: {str(e)}")
             return self._create_basic_analysis(article, category)
     
+    BATCH_MAX_ARTICLES = 3
+    BATCH_MAX_CHARS = 4500  # article text per call (~1.1k tokens), leaving room for K analyses
+    _BATCH_HEADER_RE = re.compile(r"^\s*#+\s*ARTICLE\s+(\d+)\b.*$", re.MULTILINE | re.IGNORECASE)
+    
+    def batch_upsc_analysis(self, articles: List[Dict], category: str) -> List[Dict]:
+        """enhanced_upsc_analysis for many articles, packing uncached ones into as few LLM calls as possible"""
+        if not self.openai_key:
+            return [self._create_basic_analysis(a, category) for a in articles]
+        
+        kind = f"article:{category}"
+        texts = [_prep_article_text(a) for a in articles]
+        lookups = self._cache_lookup_many(kind, [dict(article_text=t, category=category) for t in texts])
+        analyses = {i: hit for i, (_, _, hit) in enumerate(lookups) if hit is not None}
+        
+        # Greedy batches under the article and character caps
+        batches, batch, size = [], [], 0
+        for i in (i for i in range(len(articles)) if i not in analyses):
+            if batch and (len(batch) == self.BATCH_MAX_ARTICLES or size + len(texts[i]) > self.BATCH_MAX_CHARS):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(i)
+            size += len(texts[i])
+        if batch:
+            batches.append(batch)
+        
+        for batch in batches:
+            block = "\n\n---\n\n".join(f"ARTICLE {n + 1}:\n{texts[i]}" for n, i in enumerate(batch))
+            try:
+                response = self.batch_chain.run(articles_block=block, category=category)
+            except Exception as e:
+                st.error(f"Analysis error: {str(e)}")
+                continue
+            parts = self._BATCH_HEADER_RE.split(response)
+            # parts = [preamble, n1, body1, n2, body2, ...]
+            for num, body in zip(parts[1::2], parts[2::2]):
+                n = int(num) - 1
+                if 0 <= n < len(batch) and body.strip():
+                    i = batch[n]
+                    key, vec, _ = lookups[i]
+                    analyses[i] = body.strip()
+                    self._cache_store(kind, key, vec, analyses[i])
+        
+        results = []
+        for i, article in enumerate(articles):
+            if i not in analyses:
+                # Missing from the batch reply: fall back to a single call
+                results.append(self.enhanced_upsc_analysis(article, category))
+                continue
+            results.append({
+                'analysis': analyses[i],
+                'processed_with_ai': True,
+                'article_title': article.get('title', ''),
+                'article_url': article.get('url', '')
+            })
+        return results
+    
     def _create_basic_analysis(self, article: Dict, category: str) -> Dict:
         """Create basic analysis when AI is not available"""
         title = article.get('title', '')
@@ -455,6 +755,80 @@ Answer:
             'article_url': article.get('url', '')
         }
 
+class _NewsCacheMiss(Exception):
+    """_fetch_news_cached() was probed for an entry it doesn't hold"""
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _fetch_news_cached(newsapi_key: str, category: str, days_back: int, max_articles: int,
+                       hour_bucket: str, _articles: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    NewsAPI results per (key, category, window, UTC hour), read and filled on the
+    script thread: without _articles this only probes (a miss raises, and st.cache_data
+    doesn't cache exceptions); with the articles a worker fetched, it stores them.
+    The hour bucket makes the date window roll over on time even within the TTL.
+    """
+    if _articles is None:
+        raise _NewsCacheMiss(category)
+    return _articles
+
+@st.cache_resource
+def get_analyzer(newsapi_key: str, openai_key: str = None) -> UPSCNewsAnalyzer:
+    """One analyzer (LLM clients, chains, HTTP session) per key pair instead of per rerun"""
+    return UPSCNewsAnalyzer(newsapi_key, openai_key)
+
+CHAT_HISTORY_MAX = 50
+
+def _save_analysis(analysis_result: Dict, category: str) -> None:
+    """Save to the session, keyed by article URL: re-analyzing an article replaces its entry"""
+    saved_key = analysis_result['article_url'] or analysis_result['article_title']
+    st.session_state.setdefault('saved_analyses', {})[saved_key] = {
+        'title': analysis_result['article_title'],
+        'category': category,
+        'analysis': analysis_result['analysis'],
+        'url': analysis_result['article_url'],
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'processed_with_ai': analysis_result['processed_with_ai']
+    }
+
+def _saved_newest_first() -> List[Dict]:
+    """Saved news analyses (dict keyed by article URL), most recent first"""
+    return sorted(st.session_state.get('saved_analyses', {}).values(), key=lambda x: x['date'], reverse=True)
+
+def _clear_chat_history() -> None:
+    st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_MAX)
+
+def _clear_saved_content() -> None:
+    st.session_state.saved_analyses = {}
+    st.session_state.saved_pdf_analyses = []
+    st.session_state['_saved_cleared'] = True
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_export(analyses: Optional[Tuple[Tuple[str, str, str, str], ...]],
+                  pdf_analyses: Optional[Tuple[Tuple[str, str, str, str], ...]],
+                  generated_on: str) -> str:
+    """
+    Text export of the saved content; memoized until the saved items change.
+    analyses: (title, category, date, analysis), newest first;
+    pdf_analyses: (filename, query, date, analysis). None omits a section.
+    """
+    parts = [
+        "# UPSC News Analysis Export\n\n",
+        f"Generated on: {generated_on}\n\n",
+    ]
+    if analyses is not None:
+        parts.append("## News Articles Analysis\n\n")
+        parts.extend(
+            f"### {title}\nCategory: {category}\nDate: {date}\n{analysis}\n\n"
+            for title, category, date, analysis in analyses
+        )
+    if pdf_analyses is not None:
+        parts.append("## PDF Analysis\n\n")
+        parts.extend(
+            f"### {filename}\nQuery: {query}\nDate: {date}\n{analysis}\n\n"
+            for filename, query, date, analysis in pdf_analyses
+        )
+    return "".join(parts)
+
 def main():
     st.markdown('<h1 class="main-header">🇮🇳 UPSC Daily News Analyzer Pro</h1>', unsafe_allow_html=True)
     st.markdown("*Your comprehensive AI companion for UPSC current affairs preparation*")
@@ -470,8 +844,10 @@ def main():
         st.warning("Please enter your NewsAPI key to continue.")
         return
     
-    # Initialize analyzer
-    analyzer = UPSCNewsAnalyzer(newsapi_key, openai_key)
+    # Initialize analyzer (shared across reruns) and this session's knowledge base
+    analyzer = get_analyzer(newsapi_key, openai_key)
+    if 'knowledge_base' not in st.session_state:
+        st.session_state.knowledge_base = None
     
     # Main navigation
     tab1, tab2, tab3, tab4 = st.tabs(["📰 Daily News Analysis", "📄 PDF Analysis", "💬 AI Chat Assistant", "📚 Saved Content"])
@@ -492,24 +868,51 @@ def main():
             if not selected_categories:
                 st.warning("Please select at least one category.")
                 return
+            # Tabs persist across reruns; each category is fetched when its tab asks for it
+            st.session_state.news_request = (tuple(selected_categories), days_back, articles_per_category)
+            st.session_state.loaded_news = {}
+        
+        news_request = st.session_state.get('news_request')
+        if news_request:
+            categories, req_days_back, req_per_category = news_request
+            loaded = st.session_state.setdefault('loaded_news', {})
+            
+            if len(loaded) < len(categories) and st.button("📥 Load all categories"):
+                # Everything not loaded yet, requested concurrently
+                missing = [cat for cat in categories if cat not in loaded]
+                with st.spinner("Fetching news..."):
+                    loaded.update(analyzer.fetch_news_for_categories(missing, req_days_back, req_per_category))
             
-            all_articles = []
-            category_tabs = st.tabs([cat.replace('_', ' ').title() for cat in selected_categories])
+            category_tabs = st.tabs([cat.replace('_', ' ').title() for cat in categories])
             
-            for i, category in enumerate(selected_categories):
+            for i, category in enumerate(categories):
                 with category_tabs[i]:
                     st.markdown(f'<h2 class="category-header">{category.replace("_", " ").title()} News</h2>', unsafe_allow_html=True)
                     
-                    with st.spinner(f"Fetching {category} news..."):
-                        articles = analyzer.fetch_news_by_category(category, days_back, articles_per_category)
+                    if category not in loaded:
+                        if not st.button(f"📥 Load {category.replace('_', ' ').title()} news", key=f"load_{category}"):
+                            continue
+                        with st.spinner(f"Fetching {category} news..."):
+                            fetched = analyzer.fetch_news_by_category(category, req_days_back, req_per_category)
+                        if fetched is None:
+                            continue  # error shown; the load button stays for a retry
+                        loaded[category] = fetched
+                    articles = loaded[category]
                     
                     if not articles:
                         st.warning(f"No articles found for {category}")
                         continue
                     
-                    all_articles.extend(articles)
                     st.success(f"Found {len(articles)} relevant articles")
                     
+                    # All articles of the category in a few batched LLM calls
+                    if st.button(f"🎯 Analyze All ({len(articles)})", key=f"analyze_all_{category}"):
+                        with st.spinner("Performing UPSC analysis for all articles..."):
+                            batch_results = analyzer.batch_upsc_analysis(articles, category)
+                        for analysis_result in batch_results:
+                            _save_analysis(analysis_result, category)
+                        st.success(f"✅ {len(batch_results)} analyses completed and saved! See 📚 Saved Content.")
+                    
                     for idx, article in enumerate(articles):
                         with st.expander(f"📰 {article.get('title', 'No Title')[:80]}...", expanded=False):
                             
@@ -540,24 +943,17 @@ def main():
                                 st.markdown('</div>', unsafe_allow_html=True)
                                 
                                 # Save analysis
-                                if 'saved_analyses' not in st.session_state:
-                                    st.session_state.saved_analyses = []
-                                
-                                st.session_state.saved_analyses.append({
-                                    'title': analysis_result['article_title'],
-                                    'category': category,
-                                    'analysis': analysis_result['analysis'],
-                                    'url': analysis_result['article_url'],
-                                    'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                                    'processed_with_ai': analysis_result['processed_with_ai']
-                                })
+                                _save_analysis(analysis_result, category)
                                 
                                 st.success("✅ Analysis completed and saved!")
             
-            # Create knowledge base for chat
-            if all_articles and openai_key:
+            # Knowledge base for chat over everything loaded so far (rebuilt when that changes)
+            kb_source = tuple(cat for cat in categories if loaded.get(cat))
+            if kb_source and openai_key and st.session_state.get('knowledge_base_source') != kb_source:
                 with st.spinner("Building knowledge base for AI chat..."):
+                    all_articles = [article for cat in kb_source for article in loaded[cat]]
                     st.session_state.knowledge_base = analyzer.create_knowledge_base(all_articles)
+                    st.session_state.knowledge_base_source = kb_source
                     if st.session_state.knowledge_base:
                         st.success("🧠 Knowledge base created! You can now use the AI Chat Assistant.")
     
@@ -633,7 +1029,7 @@ def main():
         
         # Initialize chat history
         if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
+            st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_MAX)
         
         # Predefined question buttons
         st.markdown("#### 🚀 Quick Questions:")
@@ -673,24 +1069,19 @@ def main():
                     st.warning("Please fetch news first to build the knowledge base for better responses.")
                     # Fallback - direct LLM query
                     with st.spinner("Generating response..."):
-                        simple_chain = LLMChain(llm=analyzer.llm, prompt=PromptTemplate(
-                            input_variables=["question"],
-                            template="You are a UPSC mentor. Answer this question with focus on exam preparation: {question}"
-                        ))
-                        response = simple_chain.run(question=user_question)
+                        response = analyzer.simple_chain.run(question=user_question)
                     
                     st.session_state.chat_history.append({"user": user_question, "bot": response})
         
         # Display chat history
         if st.session_state.chat_history:
             st.markdown("#### 💬 Chat History:")
-            for i, chat in enumerate(reversed(st.session_state.chat_history[-5:])):  # Show last 5 chats
+            for i, chat in enumerate(itertools.islice(reversed(st.session_state.chat_history), 5)):  # Show last 5 chats
                 st.markdown(f'<div class="user-message">🙋‍♂️ <strong>You:</strong> {chat["user"]}</div>', unsafe_allow_html=True)
                 st.markdown(f'<div class="bot-message">🤖 <strong>AI Assistant:</strong><br>{chat["bot"]}</div>', unsafe_allow_html=True)
             
-            if st.button("🗑️ Clear Chat History"):
-                st.session_state.chat_history = []
-                st.rerun()
+            # on_click runs before the rerun the click triggers, so no second pass is needed
+            st.button("🗑️ Clear Chat History", on_click=_clear_chat_history)
     
     # TAB 4: Saved Content
     with tab4:
@@ -699,7 +1090,7 @@ def main():
         # Saved news analyses
         if 'saved_analyses' in st.session_state and st.session_state.saved_analyses:
             st.markdown("#### 📰 Saved News Analyses")
-            for i, saved in enumerate(st.session_state.saved_analyses):
+            for i, saved in enumerate(_saved_newest_first()):
                 with st.expander(f"📄 {saved['title'][:60]}... - {saved['category']} ({saved['date']})"):
                     st.markdown(saved['analysis'])
                     if saved.get('url'):
@@ -724,45 +1115,46 @@ def main():
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                if st.button("📄 Export as Text"):
-                    export_text = "# UPSC News Analysis Export\n\n"
-                    export_text += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
-                    
-                    if 'saved_analyses' in st.session_state:
-                        export_text += "## News Articles Analysis\n\n"
-                        for saved in st.session_state.saved_analyses:
-                            export_text += f"### {saved['title']}\n"
-                            export_text += f"Category: {saved['category']}\n"
-                            export_text += f"Date: {saved['date']}\n"
-                            export_text += f"{saved['analysis']}\n\n"
-                    
-                    if 'saved_pdf_analyses' in st.session_state:
-                        export_text += "## PDF Analysis\n\n"
-                        for saved in st.session_state.saved_pdf_analyses:
-                            export_text += f"### {saved['filename']}\n"
-                            export_text += f"Query: {saved['query']}\n"
-                            export_text += f"Date: {saved['date']}\n"
-                            export_text += f"{saved['analysis']}\n\n"
-                    
+                pdf_saved = st.session_state.get('saved_pdf_analyses')
+                analyses_snapshot = (
+                    None if 'saved_analyses' not in st.session_state else
+                    tuple((a['title'], a['category'], a['date'], a['analysis']) for a in _saved_newest_first())
+                )
+                pdf_snapshot = (
+                    None if pdf_saved is None else
+                    tuple((p['filename'], p['query'], p['date'], p['analysis']) for p in pdf_saved)
+                )
+                
+                def _export_payload() -> str:
+                    return _build_export(analyses_snapshot, pdf_snapshot, datetime.now().strftime('%Y-%m-%d %H:%M'))
+                
+                export_name = f"upsc_analysis_{datetime.now().strftime('%Y%m%d')}.txt"
+                if DEFERRED_DOWNLOAD_DATA:
+                    # Built only when the user actually downloads
+                    st.download_button(
+                        label="📄 Export as Text",
+                        data=_export_payload,
+                        file_name=export_name,
+                        mime="text/plain"
+                    )
+                elif st.button("📄 Export as Text"):
                     st.download_button(
                         label="⬇️ Download Export",
-                        data=export_text,
-                        file_name=f"upsc_analysis_{datetime.now().strftime('%Y%m%d')}.txt",
+                        data=_export_payload(),
+                        file_name=export_name,
                         mime="text/plain"
                     )
             
             with col2:
-                if st.button("🗑️ Clear All Saved Content"):
-                    st.session_state.saved_analyses = []
-                    st.session_state.saved_pdf_analyses = []
-                    st.success("All saved content cleared!")
-                    st.rerun()
+                st.button("🗑️ Clear All Saved Content", on_click=_clear_saved_content)
             
             with col3:
-                total_items = len(st.session_state.get('saved_analyses', [])) + len(st.session_state.get('saved_pdf_analyses', []))
+                total_items = len(st.session_state.get('saved_analyses', {})) + len(st.session_state.get('saved_pdf_analyses', []))
                 st.metric("Total Saved Items", total_items)
         
         else:
+            if st.session_state.pop('_saved_cleared', False):
+                st.success("All saved content cleared!")
             st.info("No saved content yet. Analyze some articles or PDFs first!")
     
     # Sidebar footer
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Dict, List
 
 from utils.api_client import post  # uses API_BASE_URL + API_KEY from .env
+from utils.ui_components import card_html, style_block
 
 st.set_page_config(page_title="Ingest News", page_icon="📥", layout="wide")
 st.title("📥 Ingest News")
@@ -34,27 +35,14 @@ CARD_CSS = """
 .sep { height:1px; background:#eef3fb; margin:10px 0; }
 </style>
 """
-st.markdown(CARD_CSS, unsafe_allow_html=True)
+st.markdown(style_block(CARD_CSS), unsafe_allow_html=True)
 
 # --------- Helpers ----------
-def clean_bullets(bullets: List[str]) -> List[str]:
-    cleaned = []
-    for b in bullets or []:
-        if not b:
-            continue
-        t = str(b).strip("-• ").strip()
-        if len(t) < 3:
-            continue
-        if t.lower() in {"and","or","the","of","in","to"}:
-            continue
-        if not any(c.isalpha() for c in t):
-            continue
-        cleaned.append(t)
-    return cleaned
-
+@st.cache_data(ttl=300, show_spinner=False)
 def api_ingest(query: str, days_back: int, page_size: int,
                use_newsapi: bool, use_pib: bool, use_prs: bool,
                ai_mode: str) -> Dict:
+    # Memoized per parameter set for 5 minutes; failures raise so they are not cached
     payload = {
         "query": query,
         "days_back": days_back,
@@ -64,12 +52,14 @@ def api_ingest(query: str, days_back: int, page_size: int,
         "page_size": page_size,
         "ai_mode": "deep" if ai_mode.lower() == "deep" else "fast",
     }
-    return post("/ingest/news", json=payload)
-
-def api_save_note(date_str: str, item: Dict) -> Dict:
-    # backend expects SaveNoteRequest (same fields as IngestItem + date)
-    body = {
-        "date": date_str,
+    data = post("/ingest/news", json=payload)
+    if data.get("error"):
+        raise RuntimeError(data["error"])
+    return data
+
+def _note_body(item: Dict) -> Dict:
+    # IngestItem fields as the backend expects them
+    return {
         "title": item.get("title",""),
         "url": item.get("url"),
         "publishedAt": item.get("publishedAt"),
@@ -85,7 +75,14 @@ def api_save_note(date_str: str, item: Dict) -> Dict:
         "institutions": item.get("institutions",[]),
         "dates": item.get("dates",[])
     }
-    return post("/notes/save", json=body)
+
+def api_save_note(date_str: str, item: Dict) -> Dict:
+    # backend expects SaveNoteRequest (same fields as IngestItem + date)
+    return post("/notes/save", json={"date": date_str, **_note_body(item)})
+
+def api_save_notes_bulk(date_str: str, items: List[Dict]) -> Dict:
+    # one round-trip (and one notes-file write) for the whole selection
+    return post("/notes/save_bulk", json={"date": date_str, "items": [_note_body(it) for it in items]})
 
 # --------- Controls ----------
 c1, c2 = st.columns([3,2])
@@ -156,7 +153,12 @@ if fetch_now:
                 ai_mode=ai_mode,
             )
         items = data.get("items", [])
+        # Render work (bullet cleaning, joins, escaping) happens once, here
+        for it in items:
+            it["_card_html"] = card_html(it)
         st.session_state["ingested_items"] = items
+        for k in [k for k in st.session_state if str(k).startswith("pick_")]:
+            del st.session_state[k]  # selections belong to the previous result set
         st.success(f"Fetched {len(items)} ranked items.")
     except Exception as e:
         st.error(f"Backend API not reachable or failed: {e}")
@@ -166,66 +168,40 @@ items: List[Dict] = st.session_state.get("ingested_items", [])
 # --------- Render cards ----------
 if items:
     st.subheader("🧾 UPSC Cards (Sorted by AI Relevance)")
+    # One form for all cards: a checkbox per card, actions run once on submit
+    cards_form = st.form("cards_form")
     for idx, it in enumerate(items, start=1):
-        cat = (it.get("category","general") or "general").replace("_"," ").title()
-        rel = int(it.get("relevance", 0))
-        title = it.get("title","(No title)")
-        source = it.get("source","")
-        published = it.get("publishedAt","")
-        url = it.get("url","") or ""
-
-        st.markdown(f"""
-<div class="upsc-card">
-  <div>
-    <span class="badge">{cat}</span>
-    <span class="badge">⭐ Relevance: {rel}/10</span>
-  </div>
-  <h4>📰 {title}</h4>
-  <div class="meta">
-    {'📅 ' + published if published else ''} {' • 🔗 ' + source if source else ''} {(' • <a href="'+url+'" target="_blank">Read full</a>') if url else ''}
-  </div>
-  <div class="sep"></div>
-""", unsafe_allow_html=True)
-
-        # English-only summaries on cards
-        if it.get("summary_en"):
-            st.markdown("**✅ Summary (English):**")
-            st.write(it["summary_en"])
-
-        # Prelims / Mains (cleaned bullets)
-        prelims = clean_bullets(it.get("prelims_points", []))
-        mains = clean_bullets(it.get("mains_angles", []))
-        if prelims:
-            st.markdown("**📌 Prelims Pointers:**")
-            st.markdown("- " + "\n- ".join(prelims))
-        if mains:
-            st.markdown("**📝 Mains Analysis:**")
-            st.markdown("- " + "\n- ".join(mains))
-
-        # Tail bits
-        tail_bits = []
-        if it.get("schemes_acts_policies"):
-            tail_bits.append("**Schemes/Acts/Policies:** " + ", ".join(it["schemes_acts_policies"]))
-        if it.get("institutions"):
-            tail_bits.append("**Institutions:** " + ", ".join(it["institutions"]))
-        if it.get("dates"):
-            tail_bits.append("**Dates:** " + ", ".join(it["dates"]))
-        if tail_bits:
-            st.markdown("<div class='sep'></div>", unsafe_allow_html=True)
-            st.markdown("  \n".join(tail_bits))
-
-        # Actions row
-        c1, c2, c3 = st.columns([1,1,6])
-        if c1.button("⭐ Save to Notes", key=f"save_{idx}"):
-            try:
-                resp = api_save_note(notes_date, it)
-                msg = resp["message"] if isinstance(resp, dict) and "message" in resp else "Saved."
-                st.success(msg)
-            except Exception as e:
-                st.error(f"Save failed: {e}")
-        if c2.button("📋 Copy Title", key=f"copy_{idx}"):
-            st.code(title)
-
-        st.markdown("</div>", unsafe_allow_html=True)
+        if "_card_html" not in it:
+            it["_card_html"] = card_html(it)
+        cards_form.markdown(it["_card_html"], unsafe_allow_html=True)
+        cards_form.checkbox("Select", key=f"pick_{idx}")
+
+    c1, c2, _ = cards_form.columns([2,2,4])
+    save_clicked = c1.form_submit_button("⭐ Save selected to Notes", type="primary")
+    copy_clicked = c2.form_submit_button("📋 Copy selected titles")
+    picked = [it for idx, it in enumerate(items, start=1) if st.session_state.get(f"pick_{idx}")]
+    if (save_clicked or copy_clicked) and not picked:
+        st.warning("Select at least one card first.")
+    elif save_clicked:
+        resp = api_save_notes_bulk(notes_date, picked)
+        if not resp.get("error"):
+            st.success(f"{resp['raw'].get('message', 'Saved')} (notes for {notes_date}).")
+        else:
+            # Older backend without /notes/save_bulk: one request per item (saves are idempotent)
+            saved, failed = 0, []
+            for it in picked:
+                try:
+                    resp = api_save_note(notes_date, it)
+                    if isinstance(resp, dict) and resp.get("error"):
+                        raise RuntimeError(resp["error"])
+                    saved += 1
+                except Exception as e:
+                    failed.append(f"{it.get('title','(No title)')}: {e}")
+            if saved:
+                st.success(f"Saved {saved} item(s) to notes for {notes_date}.")
+            for msg in failed:
+                st.error(f"Save failed: {msg}")
+    elif copy_clicked:
+        st.code("\n".join(str(it.get("title","(No title)")) for it in picked))
 else:
     st.info("Use a quick query or enter your own, then click **Fetch & Rank**.")
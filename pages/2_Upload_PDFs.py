@@ -1,13 +1,69 @@
 # pages/2_Upload_PDFs.py
+import hashlib
 import streamlit as st
 from datetime import datetime
-from utils.analyzer_wrapper import analyze_pdf_and_build_notes
+from operator import itemgetter
+from typing import Any, BinaryIO, Dict, List, Tuple
+from utils.analyzer_wrapper import analyze_text_grouped, build_notes
+from utils.pdf_reader import extract_pdf_text_bytes_parallel
 from utils.docx_exporter import build_docx_from_notes
+from utils.ui_components import DEFERRED_DOWNLOAD_DATA, style_block
 
 st.set_page_config(page_title="Upload PDFs - UNISOLE UPSC", layout="wide")
 
+class AnalysisFailed(Exception):
+    """Raised when the PDF yields no usable text"""
+
+# Each stage is memoized on its own input, so changing the relevance slider
+# only re-filters, and re-analysing the same PDF skips extraction and the LLM.
+@st.cache_data(max_entries=8, show_spinner=False)
+def extract_pdf_cached(digest: str, _pdf_file: BinaryIO, enable_ocr: bool) -> Tuple[str, int, str]:
+    """(raw_text, num_pages, method) memoized on the upload's sha256 + OCR flag"""
+    _pdf_file.seek(0)
+    return extract_pdf_text_bytes_parallel(_pdf_file, enable_ocr=enable_ocr)
+
+@st.cache_data(ttl=3600, max_entries=4, show_spinner=False)
+def analyze_text_cached(text_digest: str, _raw_text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """LLM analysis memoized on the sha256 of the extracted text; errors are not cached"""
+    return analyze_text_grouped(_raw_text)
+
+def analyze_upload(uploaded, digest: str, enable_ocr: bool, min_relevance: float) -> Dict[str, Any]:
+    raw_text, num_pages, method = extract_pdf_cached(digest, uploaded, enable_ocr)
+    if not raw_text or len(raw_text.strip()) < 100:
+        raise AnalysisFailed("PDF contains insufficient readable text")
+    text_digest = hashlib.sha256(raw_text.encode("utf-8", "surrogatepass")).hexdigest()
+    grouped = analyze_text_cached(text_digest, raw_text)
+    return build_notes(grouped, num_pages, method, min_relevance)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_docx_cached(result_key: str, _result: Dict[str, Any]) -> bytes:
+    """DOCX bytes for one analysis, built once per result_key (upload digest + settings)"""
+    return build_docx_from_notes(_result, title="UNISOLE UPSC Notes")
+
+def clear_analysis() -> None:
+    st.session_state.pop("analysis", None)
+    st.session_state.pop("analysis_key", None)
+
+def _relevance(item: Dict) -> int:
+    return int(item.get("relevance", 0))
+
+def sorted_groups(result: Dict[str, Any]) -> List[Tuple[int, str, List[Dict]]]:
+    """
+    (-count, category, items) for non-empty categories, biggest first then by name,
+    items most relevant first. Computed once per analysis result (same object
+    across reruns via session_state).
+    """
+    cached = st.session_state.get("_groups_cache")
+    if cached is None or cached[0] is not result:
+        entries = [(-len(v), k, sorted(v, key=_relevance, reverse=True))
+                   for k, v in result.get("grouped", {}).items() if v]
+        entries.sort(key=itemgetter(0, 1))
+        cached = (result, entries)
+        st.session_state["_groups_cache"] = cached
+    return cached[1]
+
 # Custom CSS matching your news ingestion design
-st.markdown("""
+PAGE_CSS = """
 <style>
     .category-badge {
         background: #e3f2fd;
@@ -35,7 +91,8 @@ st.markdown("""
         margin-bottom: 16px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(style_block(PAGE_CSS), unsafe_allow_html=True)
 
 st.title("📄 UPSC Cards (Sorted by AI Relevance)")
 
@@ -53,8 +110,9 @@ with st.sidebar:
 uploaded_file = st.file_uploader("Upload Newspaper PDF", type=["pdf"])
 
 if uploaded_file:
-    bytes_data = uploaded_file.read()
-    file_size_mb = len(bytes_data) / (1024 * 1024)
+    # The upload is already held in memory by Streamlit; work on it in place
+    # instead of copying it with .read()
+    file_size_mb = uploaded_file.size / (1024 * 1024)
     
     # Show file info
     st.info(f"📄 File: {uploaded_file.name} ({file_size_mb:.2f} MB)")
@@ -75,22 +133,17 @@ if uploaded_file:
     if st.button("🔎 Analyze & Generate Cards", type="primary"):
         with st.spinner("🧠 AI Analysis in progress... This may take 1-2 minutes"):
             try:
-                result = analyze_pdf_and_build_notes(
-                    bytes_data,
-                    mode="deep",
-                    deep_k=deep_count,
-                    enable_ocr=enable_ocr,
-                    min_relevance=min_relevance
-                )
-                
-                # Check if analysis was successful
-                if not result.get("ok", False):
-                    st.error(f"❌ Analysis failed: {result.get('error', 'Unknown error')}")
-                    st.stop()
-                
+                digest = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+                result = analyze_upload(uploaded_file, digest, enable_ocr, min_relevance)
+                for k in [k for k in st.session_state if str(k).startswith("pick_")]:
+                    del st.session_state[k]  # selections belong to the previous result
                 st.session_state["analysis"] = result
+                st.session_state["analysis_key"] = f"{digest}:{enable_ocr}:{min_relevance}"
                 st.success("✅ Analysis Complete!")
                 st.rerun()
+            except AnalysisFailed as e:
+                st.error(f"❌ Analysis failed: {e}")
+                st.stop()
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
                 import traceback
@@ -125,101 +178,110 @@ if "analysis" in st.session_state:
     if not grouped or total_items == 0:
         st.warning("No items found. Try lowering the minimum relevance score.")
     else:
-        for category, items in sorted(grouped.items(), key=lambda x: (-len(x[1]), x[0])):
-            if not items:
-                continue
-            
-            st.markdown(f"## {category.replace('_', ' ').title()}")
+        # One form for all cards: a checkbox per card, actions run once on submit
+        with st.form("pdf_cards_form"):
+            for _, category, items in sorted_groups(result):
+                st.markdown(f"## {category.replace('_', ' ').title()}")
             
-            for idx, item in enumerate(items, 1):
-                with st.container():
-                    # Category and Relevance badges
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.markdown(f'<span class="category-badge">{category.title()}</span>', 
-                                  unsafe_allow_html=True)
-                    with col2:
-                        rel = item.get("relevance", 0)
-                        st.markdown(f'<span class="relevance-badge">⭐ Relevance: {rel}/10</span>', 
-                                  unsafe_allow_html=True)
+                for idx, item in enumerate(items, 1):
+                    with st.container():
+                        # Category and Relevance badges
+                        col1, col2 = st.columns([3, 1])
+                        with col1:
+                            st.markdown(f'<span class="category-badge">{category.title()}</span>', 
+                                      unsafe_allow_html=True)
+                        with col2:
+                            rel = item.get("relevance", 0)
+                            st.markdown(f'<span class="relevance-badge">⭐ Relevance: {rel}/10</span>', 
+                                      unsafe_allow_html=True)
                     
-                    # Icon
-                    st.markdown("📰")
+                        # Icon
+                        st.markdown("📰")
                     
-                    # Metadata
-                    timestamp = item.get("timestamp", "")
-                    source = item.get("source", "PDF Document")
-                    dates = item.get("dates", [])
-                    date_str = ", ".join(dates) if dates else timestamp
-                    st.markdown(f'<div class="metadata">📅 {date_str} • 🔗 {source}</div>', 
-                              unsafe_allow_html=True)
+                        # Metadata
+                        timestamp = item.get("timestamp", "")
+                        source = item.get("source", "PDF Document")
+                        dates = item.get("dates", [])
+                        date_str = ", ".join(dates) if dates else timestamp
+                        st.markdown(f'<div class="metadata">📅 {date_str} • 🔗 {source}</div>', 
+                                  unsafe_allow_html=True)
                     
-                    # Summary (English)
-                    st.markdown("### ✅ Summary (English):")
+                        # Summary (English)
+                        st.markdown("### ✅ Summary (English):")
                     
-                    title = item.get("title", "")
-                    if title:
-                        st.markdown(f"**{title}**")
+                        title = item.get("title", "")
+                        if title:
+                            st.markdown(f"**{title}**")
                     
-                    summary = item.get("summary", item.get("summary_en", ""))
-                    if summary:
-                        st.markdown(summary)
+                        summary = item.get("summary", item.get("summary_en", ""))
+                        if summary:
+                            st.markdown(summary)
                     
-                    # Hindi summary if available
-                    summary_hi = item.get("summary_hi", "")
-                    if summary_hi:
-                        st.markdown("### सार (हिंदी):")
-                        st.markdown(summary_hi)
+                        # Hindi summary if available
+                        summary_hi = item.get("summary_hi", "")
+                        if summary_hi:
+                            st.markdown("### सार (हिंदी):")
+                            st.markdown(summary_hi)
                     
-                    # Schemes/Acts/Policies
-                    schemes = item.get("schemes_acts_policies", [])
-                    if schemes:
-                        st.markdown(f"**📜 Schemes/Acts/Policies:** {', '.join(schemes)}")
+                        # Schemes/Acts/Policies
+                        schemes = item.get("schemes_acts_policies", [])
+                        if schemes:
+                            st.markdown(f"**📜 Schemes/Acts/Policies:** {', '.join(schemes)}")
                     
-                    # Institutions
-                    institutions = item.get("institutions", [])
-                    if institutions:
-                        st.markdown(f"**🏛️ Institutions:** {', '.join(institutions)}")
+                        # Institutions
+                        institutions = item.get("institutions", [])
+                        if institutions:
+                            st.markdown(f"**🏛️ Institutions:** {', '.join(institutions)}")
                     
-                    # Prelims Pointers
-                    prelims = item.get("prelims_points", item.get("prelims", []))
-                    if prelims:
-                        st.markdown("### 📌 Prelims Pointers:")
-                        for p in prelims[:5]:  # Show max 5
-                            st.markdown(f"• {p}")
+                        # Prelims Pointers
+                        prelims = item.get("prelims_points", item.get("prelims", []))
+                        if prelims:
+                            st.markdown("### 📌 Prelims Pointers:")
+                            for p in prelims[:5]:  # Show max 5
+                                st.markdown(f"• {p}")
                     
-                    # Key Facts
-                    key_facts = item.get("key_facts", [])
-                    if key_facts:
-                        st.markdown("### 💡 Key Facts:")
-                        for fact in key_facts[:5]:
-                            st.markdown(f"• {fact}")
+                        # Key Facts
+                        key_facts = item.get("key_facts", [])
+                        if key_facts:
+                            st.markdown("### 💡 Key Facts:")
+                            for fact in key_facts[:5]:
+                                st.markdown(f"• {fact}")
                     
-                    # Mains Analysis
-                    deep = item.get("deep", {})
-                    mains = deep.get("mains_angles", item.get("mains_angles", []))
-                    if mains:
-                        st.markdown("### 📝 Mains Analysis:")
-                        for m in mains[:3]:  # Show max 3
-                            st.markdown(f"• {m}")
+                        # Mains Analysis
+                        deep = item.get("deep", {})
+                        mains = deep.get("mains_angles", item.get("mains_angles", []))
+                        if mains:
+                            st.markdown("### 📝 Mains Analysis:")
+                            for m in mains[:3]:  # Show max 3
+                                st.markdown(f"• {m}")
                     
-                    # Interview Questions
-                    interview = deep.get("interview_questions", item.get("interview_questions", []))
-                    if interview:
-                        with st.expander("💬 Interview Questions"):
-                            for q in interview:
-                                st.markdown(f"• {q}")
+                        # Interview Questions
+                        interview = deep.get("interview_questions", item.get("interview_questions", []))
+                        if interview:
+                            with st.expander("💬 Interview Questions"):
+                                for q in interview:
+                                    st.markdown(f"• {q}")
                     
-                    # Action buttons
-                    col1, col2 = st.columns([1, 3])
-                    with col1:
-                        if st.button("⭐ Save to Notes", key=f"save_{category}_{idx}"):
-                            st.success("Saved!")
-                    with col2:
-                        if st.button("📋 Copy Title", key=f"copy_{category}_{idx}"):
-                            st.success("Title copied!")
+                        st.checkbox("Select", key=f"pick_{category}_{idx}")
                     
-                    st.markdown("---")
+                        st.markdown("---")
+
+            c1, c2, _ = st.columns([2, 2, 4])
+            save_clicked = c1.form_submit_button("⭐ Save selected to Notes", type="primary")
+            copy_clicked = c2.form_submit_button("📋 Copy selected titles")
+
+        picked = [
+            item
+            for _, category, items in sorted_groups(result)
+            for idx, item in enumerate(items, 1)
+            if st.session_state.get(f"pick_{category}_{idx}")
+        ]
+        if (save_clicked or copy_clicked) and not picked:
+            st.warning("Select at least one card first.")
+        elif save_clicked:
+            st.success(f"Saved {len(picked)} item(s)!")
+        elif copy_clicked:
+            st.code("\n".join(str(item.get("title", "")) for item in picked))
     
     # Download section
     st.markdown("### 📥 Download")
@@ -227,11 +289,14 @@ if "analysis" in st.session_state:
     
     col1, col2 = st.columns(2)
     with col1:
+        result_key = st.session_state.get("analysis_key") or \
+            hashlib.blake2b(repr(result).encode("utf-8"), digest_size=16).hexdigest()
         try:
-            docx_bytes = build_docx_from_notes(result, title="UNISOLE UPSC Notes")
             st.download_button(
                 "⬇️ Download DOCX",
-                data=docx_bytes,
+                # Deferred: serialized only when clicked; otherwise once per analysis
+                data=(lambda: build_docx_cached(result_key, result)) if DEFERRED_DOWNLOAD_DATA
+                else build_docx_cached(result_key, result),
                 file_name=f"UPSC_Notes_{timestamp_file}.docx",
                 mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 use_container_width=True
@@ -240,9 +305,9 @@ if "analysis" in st.session_state:
             st.error(f"Error generating DOCX: {str(e)}")
     
     with col2:
-        if st.button("🗑️ Clear Analysis", use_container_width=True):
-            del st.session_state["analysis"]
-            st.rerun()
+        # on_click runs before the rerun the click triggers, so no second pass is needed
+        st.button("🗑️ Clear Analysis", use_container_width=True,
+                  on_click=clear_analysis)
 
 else:
     # Welcome message
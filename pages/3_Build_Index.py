@@ -14,18 +14,39 @@ import streamlit as st
 
 from langchain.schema import Document
 
-from utils.vector_store import get_vectorstore, add_documents
-from utils.pdf_reader import extract_text_from_pdf
+from utils.vector_store import get_vectorstore, add_documents, clear_vectorstore
+from utils.pdf_reader import extract_texts_from_pdfs
+from utils.chunking import chunk_offsets
 from utils.config import UPLOAD_DIR
+from utils.ui_components import today_str
 
 st.set_page_config(page_title="Build Index", page_icon="🧱", layout="wide")
 st.title("🧱 Build / Update Index")
 
-# Date box
-def today_str():
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d")
+def _source_name(it: dict) -> str:
+    src = it.get("source") or {}
+    return src.get("name", "") if isinstance(src, dict) else str(src)
+
+def _news_block(it: dict) -> str:
+    """One news item as the labelled text block that gets chunked into the index."""
+    return "\n".join((
+        "Title: " + str(it.get("title", "")),
+        "Category: " + str(it.get("category", "")),
+        "Tags: " + ", ".join(it.get("tags", [])),
+        "Summary(EN): " + str(it.get("summary_en", "")),
+        "Summary(HI): " + str(it.get("summary_hi", "")),
+        "Prelims: " + str(it.get("prelims_points", "")),
+        "Mains: " + str(it.get("mains_angles", "")),
+        "Interview: " + str(it.get("interview_questions", "")),
+        " | ".join((
+            "Source: " + _source_name(it),
+            "URL: " + str(it.get("url", "")),
+            "Published: " + str(it.get("publishedAt", "")),
+        )),
+        "",
+    ))
 
+# Date box
 date_str = st.text_input("Index Date (YYYY-MM-DD)", value=today_str())
 chunk_size = st.slider("Chunk size", 600, 2000, 1200, 100)
 overlap = st.slider("Overlap", 50, 400, 150, 10)
@@ -41,27 +62,17 @@ if st.button("🧠 Ingest Fetched News"):
         docs: List[Document] = []
         ts = datetime.now().strftime("%Y-%m-%d %H:%M")
         for it in items:
-            block = (
-                f"Title: {it.get('title','')}\n"
-                f"Category: {it.get('category','')}\n"
-                f"Tags: {', '.join(it.get('tags', []))}\n"
-                f"Summary(EN): {it.get('summary_en','')}\n"
-                f"Summary(HI): {it.get('summary_hi','')}\n"
-                f"Prelims: {it.get('prelims_points','')}\n"
-                f"Mains: {it.get('mains_angles','')}\n"
-                f"Interview: {it.get('interview_questions','')}\n"
-                f"Source: {it.get('source',{}).get('name','')} | URL: {it.get('url','')} | Published: {it.get('publishedAt','')}\n"
-            )
-            # Simple chunking by length
-            for i in range(0, len(block), max(1, chunk_size - overlap)):
-                chunk = block[i:i+chunk_size]
-                docs.append(Document(page_content=chunk, metadata={
-                    "source": it.get("source",{}).get("name",""),
-                    "url": it.get("url",""),
-                    "category": it.get("category",""),
-                    "date": date_str,
-                    "ingested_at": ts,
-                }))
+            block = _news_block(it)
+            # Simple chunking by length (metadata built once per item)
+            md = {
+                "source": _source_name(it),
+                "url": it.get("url",""),
+                "category": it.get("category",""),
+                "date": date_str,
+                "ingested_at": ts,
+            }
+            docs.extend(Document(page_content=block[s:e], metadata=md)
+                        for s, e in chunk_offsets(len(block), chunk_size, overlap))
         added = add_documents(vs, docs)
         st.success(f"Added {added} chunks from fetched news to {date_str}.")
 
@@ -73,27 +84,21 @@ if st.button("📥 Ingest PDFs from uploads/"):
     else:
         docs: List[Document] = []
         ts = datetime.now().strftime("%Y-%m-%d %H:%M")
-        for fname in pdfs:
-            path = os.path.join(UPLOAD_DIR, fname)
-            text = extract_text_from_pdf(path)
-            for i in range(0, len(text), max(1, chunk_size - overlap)):
-                chunk = text[i:i+chunk_size]
-                docs.append(Document(page_content=chunk, metadata={
-                    "source": fname,
-                    "date": date_str,
-                    "ingested_at": ts,
-                }))
+        # PDFs are parsed in parallel worker processes; docs are built here in order
+        texts = extract_texts_from_pdfs([os.path.join(UPLOAD_DIR, f) for f in pdfs])
+        for fname, text in zip(pdfs, texts):
+            md = {"source": fname, "date": date_str, "ingested_at": ts}
+            docs.extend(Document(page_content=text[s:e], metadata=md)
+                        for s, e in chunk_offsets(len(text), chunk_size, overlap))
         added = add_documents(vs, docs)
         st.success(f"Added {added} chunks from PDFs to {date_str}.")
 
 # Danger: clear index
 if st.button("🗑️ Clear index for this date"):
-    import shutil
     try:
-        base = vs._persist_directory  # path used by Chroma
-        shutil.rmtree(base)
-        os.makedirs(base, exist_ok=True)
-        st.success("Index cleared. (Restart retrieval cache if needed)")
+        # Drops only this date's vectors (FAISS files / Chroma collection)
+        clear_vectorstore(vs)
+        st.success(f"Index cleared for {date_str}.")
     except Exception as e:
         st.error(str(e))
 
@@ -9,16 +9,12 @@
 import streamlit as st
 from utils.vector_store import get_vectorstore
 from utils.rag_engine import answer_with_rag
+from utils.ui_components import today_str
 
 st.set_page_config(page_title="Ask Questions", page_icon="💬", layout="wide")
 st.title("💬 Ask UPSC Questions (RAG)")
 
 # Controls
-
-def today_str():
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d")
-
 date_str = st.text_input("Index Date (YYYY-MM-DD)", value=today_str())
 language = st.radio("Answer Language", ["English", "Hindi", "Both"], index=2, horizontal=True)
 query = st.text_input("Your question", placeholder="e.g., List new schemes and their ministries mentioned today")
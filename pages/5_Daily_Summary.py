@@ -8,16 +8,12 @@
 import streamlit as st
 from utils.vector_store import get_vectorstore
 from utils.summaries import generate_daily_summary, save_daily_summary
+from utils.ui_components import today_str
 
 st.set_page_config(page_title="Daily Summary", page_icon="📰", layout="wide")
 st.title("📰 Daily Summary (Bilingual)")
 
 # Controls
-
-def today_str():
-    from datetime import datetime
-    return datetime.now().strftime("%Y-%m-%d")
-
 date_str = st.text_input("Index Date (YYYY-MM-DD)", value=today_str())
 language = st.radio("Summary Language", ["English", "Hindi", "Both"], index=2, horizontal=True)
 
@@ -1,54 +1,51 @@
 # pages/6_My_Saved_Notes.py
 # 📚 My Saved Notes — Clean UPSC Cards • Filter • Pagination • DOCX Export • Delete
 
-import os
-import json
-from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
+import pandas as pd
 import streamlit as st
 
-from utils.config import DATA_DIR, UPSC_CATEGORIES
+from utils.config import UPSC_CATEGORIES
 from utils.docx_exporter import export_notes_to_docx
+from utils.notes_store import (
+    SAVED_NOTES_DIR, apply_op, get_day, list_days, migrate_legacy_notes, notes_etag,
+)
 
 st.set_page_config(page_title="My Saved Notes", page_icon="📚", layout="wide")
 st.title("📚 My Saved Notes")
 st.caption("Review, filter, export, or delete your saved UPSC notes.")
 
-SAVED_NOTES_PATH = os.path.join(DATA_DIR, "saved_notes.json")
-os.makedirs(DATA_DIR, exist_ok=True)
+# Notes live in the per-date store shared with the API; split an old
+# saved_notes.json on first run (no-op once migrated)
+migrate_legacy_notes()
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def load_saved() -> Dict[str, List[Dict[str, Any]]]:
-    if not os.path.exists(SAVED_NOTES_PATH):
-        return {}
-    try:
-        with open(SAVED_NOTES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def save_saved(data: Dict[str, List[Dict[str, Any]]]) -> None:
-    with open(SAVED_NOTES_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def notes_for_date(data: Dict[str, List[Dict[str, Any]]], date_str: str) -> List[Dict[str, Any]]:
-    return data.get(date_str, [])
-
-def to_notes_by_cat(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    # Convert flat list -> {category: [items]}
+@st.cache_data(show_spinner=False, max_entries=16)
+def notes_frame(date_str: str, version: str) -> Tuple[List[Dict[str, Any]], pd.DataFrame]:
+    """
+    One date's notes plus a (category, relevance) frame indexed by position in
+    that list, for vectorized filter/sort/group. Re-read only when the date's
+    file changes (version = its ETag).
+    """
+    items = list(get_day(date_str))
+    frame = pd.DataFrame({
+        "category": [it.get("category") or "general" for it in items],
+        "relevance": pd.to_numeric([it.get("relevance", 0) for it in items], errors="coerce"),
+    })
+    frame["relevance"] = frame["relevance"].fillna(0).astype(int)
+    return items, frame
+
+def to_notes_by_cat(items: List[Dict[str, Any]], frame: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    # Convert flat list -> {category: [items]}, each by relevance desc; unknown categories -> general
     cats = {c: [] for c in UPSC_CATEGORIES}
     cats["general"] = []
-    for it in items:
-        c = (it.get("category") or "general")
-        if c not in cats:
-            c = "general"
-        cats[c].append(it)
-    # Sort each by relevance desc
-    for k in cats:
-        cats[k].sort(key=lambda x: int(x.get("relevance", 0)), reverse=True)
+    keys = frame["category"].where(frame["category"].isin(list(cats)), "general")
+    ordered = frame.assign(cat=keys).sort_values("relevance", ascending=False, kind="stable")
+    for cat, group in ordered.groupby("cat", sort=False):
+        cats[cat] = [items[i] for i in group.index]
     return cats
 
 # -----------------------------
@@ -82,15 +79,14 @@ st.markdown(CARD_CSS, unsafe_allow_html=True)
 # -----------------------------
 # Load & basic checks
 # -----------------------------
-saved = load_saved()
-if not saved:
+all_dates = list_days()
+if not all_dates:
     st.info("No saved notes yet. Go to **📥 Ingest News** and click **⭐ Save to Notes** on any item.")
     st.stop()
 
 # -----------------------------
 # Controls
 # -----------------------------
-all_dates = sorted(saved.keys(), reverse=True)
 sel_date = st.selectbox("Select Date", all_dates, index=0, key="msn_date")
 
 all_cats = ["All"] + [c for c in UPSC_CATEGORIES] + ["general"]
@@ -102,31 +98,28 @@ include_hindi_docx = st.checkbox("Include Hindi content in DOCX export?", value=
 col_actions = st.columns(3)
 with col_actions[0]:
     if st.button("🗑️ Delete ALL notes for this date", key="delete_day"):
-        if sel_date in saved:
-            del saved[sel_date]
-            save_saved(saved)
-            st.success(f"Deleted all notes for {sel_date}.")
-            st.experimental_rerun()
+        apply_op({"op": "delete_day", "date": sel_date})
+        st.success(f"Deleted all notes for {sel_date}.")
+        st.rerun()
 with col_actions[1]:
     if st.button("🔄 Refresh list", key="refresh_list"):
-        st.experimental_rerun()
+        st.rerun()
 
 st.markdown("---")
 
 # -----------------------------
 # Filter + sort + paginate
 # -----------------------------
-items = notes_for_date(saved, sel_date)
+day_items, day_frame = notes_frame(sel_date, notes_etag(sel_date))
 
 # Filter by category
-if sel_cat != "All":
-    items = [it for it in items if (it.get("category") == sel_cat)]
+view = day_frame if sel_cat == "All" else day_frame[day_frame["category"] == sel_cat]
 
 # Sort by relevance
 if sort_by_relevance:
-    items.sort(key=lambda x: int(x.get("relevance", 0)), reverse=True)
+    view = view.sort_values("relevance", ascending=False, kind="stable")
 
-total = len(items)
+total = len(view)
 if total == 0:
     st.info("No notes for this filter.")
     st.stop()
@@ -142,7 +135,7 @@ with pg_col2:
 
 start = (page_idx - 1) * per_page
 end = min(start + per_page, total)
-page_items = items[start:end]
+page_items = [day_items[i] for i in view.index[start:end]]
 
 # -----------------------------
 # DOCX Export for current filtered list
@@ -151,7 +144,7 @@ exp_col1, exp_col2 = st.columns([2,3])
 with exp_col1:
     if st.button("📥 Export Current List to DOCX", key="export_docx"):
         # Convert filtered items to notes_by_cat structure:
-        notes_by_cat = to_notes_by_cat(items)
+        notes_by_cat = to_notes_by_cat(day_items, view)
         buffer = export_notes_to_docx(notes_by_cat, date_str=sel_date, include_hindi=include_hindi_docx, pdf_name=f"Saved Notes ({sel_date})")
         st.download_button(
             label="📄 Download DOCX",
@@ -217,14 +210,11 @@ for idx, it in enumerate(page_items, start=start + 1):
     # Delete single note button
     if st.button("🗑️ Delete this note", key=f"del_{sel_date}_{idx}"):
         # Remove by matching title+url (unique enough for our use)
-        current = saved.get(sel_date, [])
-        new_list = [x for x in current if not (x.get("title")==it.get("title") and x.get("url")==it.get("url"))]
-        saved[sel_date] = new_list
-        save_saved(saved)
+        apply_op({"op": "delete_one", "date": sel_date, "title": it.get("title"), "url": it.get("url")})
         st.success("Deleted.")
-        st.experimental_rerun()
+        st.rerun()
 
     st.markdown("</div>", unsafe_allow_html=True)
 
 st.markdown("---")
-st.info(f"Notes file location: `{SAVED_NOTES_PATH}`")
+st.info(f"Notes folder: `{SAVED_NOTES_DIR}`")
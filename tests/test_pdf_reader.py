@@ -0,0 +1,38 @@
+# tests/test_pdf_reader.py
+import io
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from utils.pdf_reader import PARALLEL_MIN_PAGES, extract_pdf_text_bytes_parallel
+
+
+def _pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i} " + "UPSC current affairs " * 20)
+    return doc.tobytes()
+
+
+def test_short_in_memory_upload():
+    # BytesIO at position 0 is read as a zero-copy memoryview
+    text, pages, method = extract_pdf_text_bytes_parallel(io.BytesIO(_pdf(3)), workers=4)
+    assert pages == 3
+    assert method == "fitz"
+    assert "Page 2" in text
+
+
+def test_below_parallel_threshold():
+    text, pages, method = extract_pdf_text_bytes_parallel(io.BytesIO(_pdf(PARALLEL_MIN_PAGES - 1)), workers=4)
+    assert pages == PARALLEL_MIN_PAGES - 1
+    assert method == "fitz"
+    assert "Page 0" in text
+
+
+def test_parallel_in_memory_upload():
+    n = PARALLEL_MIN_PAGES + 4
+    text, pages, method = extract_pdf_text_bytes_parallel(io.BytesIO(_pdf(n)), workers=4)
+    assert pages == n
+    assert method == "fitz-parallel"
+    assert text.index("Page 0") < text.index(f"Page {n - 1}")
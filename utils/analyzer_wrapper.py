@@ -6,20 +6,125 @@ Analyzer wrapper - Uses REAL AI analysis
 - Memory optimized for cloud deployment
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, BinaryIO, Union
 import logging
 import gc
 from datetime import datetime
 
-from utils.pdf_reader import extract_pdf_text_bytes
+from utils.pdf_reader import extract_pdf_text_bytes_parallel
 from utils.pdf_analyzer import analyze_pdf_text
 from utils.config import UPSC_CATEGORIES
 
 logger = logging.getLogger(__name__)
 
 
+# MEMORY OPTIMIZATION: Limit text size for analysis (~100KB text limit for free tier)
+MAX_TEXT_LENGTH = 100000
+
+
+def _failed(error: str, pages: int = 0, method: str = "error") -> Dict[str, Any]:
+    return {
+        "ok": False,
+        "error": error,
+        "pages": pages,
+        "method": method,
+        "grouped": {},
+        "total_items": 0,
+        "categories": [],
+    }
+
+
+def analyze_text_grouped(raw_text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The LLM step on its own: extracted text -> {category: [items]}, unfiltered.
+    Depends only on the text, so callers can cache it by a hash of the text.
+    Exceptions propagate.
+    """
+    logger.info("🧠 Running AI analysis...")
+    if len(raw_text) > MAX_TEXT_LENGTH:
+        logger.warning(f"Text too long ({len(raw_text)} chars), truncating to {MAX_TEXT_LENGTH}")
+        raw_text = raw_text[:MAX_TEXT_LENGTH]
+
+    grouped_items, raw_responses = analyze_pdf_text(
+        full_text=raw_text,
+        language="Both",  # Support both English and Hindi
+        chunk_size=4000,  # Smaller chunks for memory
+        overlap=200,
+        debug=False
+    )
+
+    # Clear memory after analysis
+    del raw_text
+    del raw_responses
+    gc.collect()
+
+    logger.info(f"✅ AI analysis complete. Generated items for {len([k for k,v in grouped_items.items() if v])} categories")
+    return grouped_items
+
+
+def build_notes(
+    grouped_items: Dict[str, List[Dict[str, Any]]],
+    num_pages: int,
+    method: str,
+    min_relevance: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Filter analyzed items by min_relevance, fill display metadata and return
+    the news-ingestion-shaped result. Cheap; items are updated in place.
+    """
+    filtered_grouped = {}
+    total_items = 0
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+
+    for category, items in grouped_items.items():
+        if not items:
+            continue
+
+        # Filter by relevance
+        filtered_items = [
+            item for item in items
+            if int(item.get("relevance", 0)) >= min_relevance
+        ]
+
+        # Add metadata to each item
+        for item in filtered_items:
+            if "timestamp" not in item:
+                item["timestamp"] = timestamp
+            if "source" not in item:
+                item["source"] = "PDF Document"
+
+            # Ensure all required fields exist
+            item.setdefault("headline", item.get("title", ""))
+            item.setdefault("summary", item.get("summary_en", ""))
+            item.setdefault("prelims", item.get("prelims_points", []))
+
+            # Build deep analysis structure
+            item.setdefault("deep", {
+                "mains_angles": item.get("mains_angles", []),
+                "interview_questions": item.get("interview_questions", []),
+                "key_facts": item.get("key_facts", []),
+            })
+
+        if filtered_items:
+            filtered_grouped[category] = filtered_items
+            total_items += len(filtered_items)
+
+    # Return in the same format as news ingestion
+    active_categories = [cat for cat, items in filtered_grouped.items() if items]
+
+    return {
+        "ok": True,
+        "pages": num_pages,
+        "method": method,
+        "grouped": filtered_grouped,
+        "total_items": total_items,
+        "categories": active_categories,
+        "timestamp": timestamp,
+    }
+
+
 def analyze_pdf_and_build_notes(
-    pdf_bytes: bytes,
+    pdf_bytes: Union[bytes, BinaryIO],
     mode: str = "deep",
     deep_k: int = 5,
     enable_ocr: bool = True,
@@ -28,11 +133,11 @@ def analyze_pdf_and_build_notes(
     """
     End-to-end PDF analysis with REAL AI:
     - Extract text (OCR fallback)
-    - Use LLM to analyze and categorize
-    - Return structured UPSC notes (same format as news ingestion)
+    - Use LLM to analyze and categorize (analyze_text_grouped)
+    - Return structured UPSC notes (build_notes; same format as news ingestion)
 
     Args:
-        pdf_bytes: PDF file as bytes
+        pdf_bytes: PDF file as bytes or a file-like (e.g. Streamlit UploadedFile, read without copying)
         mode: Analysis mode ("deep" or "quick")
         deep_k: Number of top sections to analyze deeply
         enable_ocr: Whether to use OCR fallback for scanned PDFs
@@ -45,107 +150,23 @@ def analyze_pdf_and_build_notes(
     try:
         # 1. Extract text from PDF
         logger.info("Extracting text from PDF...")
-        raw_text, num_pages, method = extract_pdf_text_bytes(
+        raw_text, num_pages, method = extract_pdf_text_bytes_parallel(
             pdf_bytes,
             enable_ocr=enable_ocr,
         )
 
         if not raw_text or len(raw_text.strip()) < 100:
-            return {
-                "ok": False,
-                "error": "PDF contains insufficient readable text",
-                "pages": num_pages,
-                "method": method,
-                "grouped": {},
-                "total_items": 0,
-                "categories": [],
-            }
+            return _failed("PDF contains insufficient readable text", num_pages, method)
 
         logger.info(f"✅ Extracted {len(raw_text)} chars via {method} from {num_pages} pages")
 
         # 2. Use REAL AI analysis (from pdf_analyzer.py)
-        logger.info("🧠 Running AI analysis...")
-        
-        # MEMORY OPTIMIZATION: Limit text size for analysis
-        max_text_length = 100000  # ~100KB text limit for free tier
-        if len(raw_text) > max_text_length:
-            logger.warning(f"Text too long ({len(raw_text)} chars), truncating to {max_text_length}")
-            raw_text = raw_text[:max_text_length]
-        
-        grouped_items, raw_responses = analyze_pdf_text(
-            full_text=raw_text,
-            language="Both",  # Support both English and Hindi
-            chunk_size=4000,  # Smaller chunks for memory
-            overlap=200,
-            debug=False
-        )
-        
-        # Clear memory after analysis
+        grouped_items = analyze_text_grouped(raw_text)
         del raw_text
-        del raw_responses
-        gc.collect()
-
-        logger.info(f"✅ AI analysis complete. Generated items for {len([k for k,v in grouped_items.items() if v])} categories")
 
         # 3. Filter by min_relevance and add metadata
-        filtered_grouped = {}
-        total_items = 0
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-        
-        for category, items in grouped_items.items():
-            if not items:
-                continue
-                
-            # Filter by relevance
-            filtered_items = [
-                item for item in items 
-                if int(item.get("relevance", 0)) >= min_relevance
-            ]
-            
-            # Add metadata to each item
-            for item in filtered_items:
-                if "timestamp" not in item:
-                    item["timestamp"] = timestamp
-                if "source" not in item:
-                    item["source"] = "PDF Document"
-                    
-                # Ensure all required fields exist
-                item.setdefault("headline", item.get("title", ""))
-                item.setdefault("summary", item.get("summary_en", ""))
-                item.setdefault("prelims", item.get("prelims_points", []))
-                
-                # Build deep analysis structure
-                item.setdefault("deep", {
-                    "mains_angles": item.get("mains_angles", []),
-                    "interview_questions": item.get("interview_questions", []),
-                    "key_facts": item.get("key_facts", []),
-                })
-            
-            if filtered_items:
-                filtered_grouped[category] = filtered_items
-                total_items += len(filtered_items)
-
-        # 4. Return in the same format as news ingestion
-        active_categories = [cat for cat, items in filtered_grouped.items() if items]
-        
-        return {
-            "ok": True,
-            "pages": num_pages,
-            "method": method,
-            "grouped": filtered_grouped,
-            "total_items": total_items,
-            "categories": active_categories,
-            "timestamp": timestamp,
-        }
+        return build_notes(grouped_items, num_pages, method, min_relevance)
 
     except Exception as e:
         logger.error(f"Error in analyze_pdf_and_build_notes: {e}", exc_info=True)
-        return {
-            "ok": False,
-            "error": str(e),
-            "pages": 0,
-            "method": "error",
-            "grouped": {},
-            "total_items": 0,
-            "categories": [],
-        }
\ No newline at end of file
+        return _failed(str(e))
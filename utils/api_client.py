@@ -5,6 +5,7 @@ Simple API client used by the Streamlit frontend to talk to the FastAPI backend.
 Behavior:
 - Reads API_BASE_URL and API_KEY from environment (supports Render/containers)
 - Sends header "x-api-key" (lowercase) which matches FastAPI's check
+- All calls share one pooled requests.Session (keep-alive, gzip, retries on 502/503/504 for GET/DELETE)
 - Supports GET, POST (json / files / form-data) and DELETE
 - Normalizes responses into dict: {"count": int, "items": list, "raw": <raw payload>}
 - Optional DEBUG via env var DEBUG_API_CLIENT=1
@@ -12,6 +13,8 @@ Behavior:
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 
 # load env from .env when running locally (safe noop in container)
@@ -35,6 +38,19 @@ DEFAULT_HEADERS: Dict[str, str] = {}
 if API_KEY:
     DEFAULT_HEADERS["x-api-key"] = API_KEY
 
+def _build_session() -> requests.Session:
+    """One keep-alive pool for every call: no TCP+TLS handshake per save/ingest"""
+    session = requests.Session()
+    # Retry's default allowed_methods leave POST alone (ingest is not idempotent)
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate", **DEFAULT_HEADERS})
+    return session
+
+_SESSION = _build_session()
+
 def _normalize_payload(resp: requests.Response) -> Dict[str, Any]:
     """Return normalized dict with keys: count, items, raw"""
     try:
@@ -63,10 +79,10 @@ def _full_url(path: str) -> str:
 
 def get(path: str, params: Optional[Dict] = None, headers: Optional[Dict] = None, timeout: int = 30):
     url = _full_url(path)
-    hdr = {**DEFAULT_HEADERS, **(headers or {})}
+    hdr = dict(headers or {})
     _debug("GET", url, "params=", params, "headers=", hdr)
     try:
-        resp = requests.get(url, headers=hdr, params=params, timeout=timeout)
+        resp = _SESSION.get(url, headers=hdr, params=params, timeout=timeout)
         resp.raise_for_status()
     except requests.RequestException as e:
         _debug("GET error:", e)
@@ -81,19 +97,19 @@ def post(path: str, json: Optional[Dict] = None, files: Optional[Dict] = None, d
       - data => form fields for multipart or x-www-form-urlencoded posts
     """
     url = _full_url(path)
-    hdr = {**DEFAULT_HEADERS, **(headers or {})}
+    hdr = dict(headers or {})
     _debug("POST", url, "json_present=", json is not None, "files_present=", files is not None, "hdr=", hdr)
 
     try:
         if json is not None:
             hdr["Content-Type"] = "application/json"
-            resp = requests.post(url, headers=hdr, json=json, timeout=timeout)
+            resp = _SESSION.post(url, headers=hdr, json=json, timeout=timeout)
         elif files is not None:
             # requests will set multipart content-type automatically
-            resp = requests.post(url, headers=hdr, files=files, data=data or {}, timeout=timeout)
+            resp = _SESSION.post(url, headers=hdr, files=files, data=data or {}, timeout=timeout)
         else:
             # form-encoded
-            resp = requests.post(url, headers=hdr, data=data or {}, timeout=timeout)
+            resp = _SESSION.post(url, headers=hdr, data=data or {}, timeout=timeout)
         resp.raise_for_status()
     except requests.RequestException as e:
         _debug("POST error:", e, "response_text:", getattr(e, "response", None) and e.response.text)
@@ -103,10 +119,10 @@ def post(path: str, json: Optional[Dict] = None, files: Optional[Dict] = None, d
 
 def delete(path: str, headers: Optional[Dict] = None, timeout: int = 30):
     url = _full_url(path)
-    hdr = {**DEFAULT_HEADERS, **(headers or {})}
+    hdr = dict(headers or {})
     _debug("DELETE", url, "hdr=", hdr)
     try:
-        resp = requests.delete(url, headers=hdr, timeout=timeout)
+        resp = _SESSION.delete(url, headers=hdr, timeout=timeout)
         resp.raise_for_status()
     except requests.RequestException as e:
         _debug("DELETE error:", e)
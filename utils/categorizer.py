@@ -7,9 +7,12 @@
 
 from __future__ import annotations
 from typing import Dict, Any, List
+import asyncio
 import re
 import json
 
+from utils.llm_async import acomplete
+
 ALLOWED_CATEGORIES = {
     "polity",
     "economy",
@@ -56,6 +59,10 @@ def _safe_json_extract(s: str) -> Dict[str, Any]:
                 return {}
     return {}
 
+# Same predicate as any(c.isalnum() for c in s) (Unicode-aware, so Hindi counts),
+# but evaluated in C. [^\W_] == "word char that is not underscore" == isalnum.
+_has_alnum = re.compile(r"[^\W_]").search
+
 def _ensure_list(value) -> List[str]:
     """
     Normalize AI field to list[str].
@@ -71,12 +78,12 @@ def _ensure_list(value) -> List[str]:
             if v is None:
                 continue
             s = str(v).strip().strip("•- ").strip()
-            if s and any(c.isalnum() for c in s):
+            if s and _has_alnum(s):
                 out.append(s)
         return out
     if isinstance(value, str):
         parts = [p.strip().strip("•- ").strip() for p in value.split("\n")]
-        return [p for p in parts if p and any(c.isalnum() for c in p)]
+        return [p for p in parts if p and _has_alnum(p)]
     return []
 
 def _normalize_category(cat: str | None, text_ctx: str = "") -> str:
@@ -200,25 +207,16 @@ Source: {source}
 # Main entry
 # ---------------------------
 
-def auto_categorize(article: Dict[str, Any], llm, mode: str = "deep") -> Dict[str, Any]:
-    """
-    Return a structured UPSC dict for a single article.
-    Keys returned (always):
-      - summary_en (str)
-      - summary_hi (str) -> "" (English only for now)
-      - prelims_points (list[str])
-      - mains_angles (list[str])
-      - interview_questions (list[str])
-      - schemes_acts_policies (list[str])
-      - institutions (list[str])
-      - dates (list[str])
-      - category (one of ALLOWED_CATEGORIES)
-    """
+def _article_fields(article: Dict[str, Any]):
     title = (article.get("title") or "").strip()
     description = (article.get("description") or "").strip()
     content = (article.get("content") or "").strip()
     url = (article.get("url") or "").strip()
     source = (article.get("source") or "").strip()
+    return title, description, content, url, source
+
+def _build_prompt(article: Dict[str, Any], mode: str = "deep") -> str:
+    title, description, content, url, source = _article_fields(article)
 
     # Keep prompts within model context limits; Groq Mixtral can handle large, still be safe:
     t = _truncate(title, 400)
@@ -226,14 +224,14 @@ def auto_categorize(article: Dict[str, Any], llm, mode: str = "deep") -> Dict[st
     c = _truncate(content, 4000)
 
     prompt = DEEP_PROMPT if (mode or "deep").lower() == "deep" else FAST_PROMPT
-    prompt_fmt = prompt.format(title=t, description=d, content=c, url=url, source=source)
+    return prompt.format(title=t, description=d, content=c, url=url, source=source)
 
-    # ---- Call LLM
-    try:
-        resp = llm.invoke(prompt_fmt)
-        raw = getattr(resp, "content", str(resp))
-    except Exception as e:
-        raw = ""
+def _build_output(article: Dict[str, Any], raw: str) -> Dict[str, Any]:
+    """Turn a raw LLM response into the always-valid UPSC dict."""
+    title, description, content, url, source = _article_fields(article)
+    t = _truncate(title, 400)
+    d = _truncate(description, 1200)
+    c = _truncate(content, 4000)
 
     data = _safe_json_extract(raw)
 
@@ -285,3 +283,54 @@ def auto_categorize(article: Dict[str, Any], llm, mode: str = "deep") -> Dict[st
     # out["title"] = data.get("title") or title
 
     return out
+
+def auto_categorize(article: Dict[str, Any], llm, mode: str = "deep") -> Dict[str, Any]:
+    """
+    Return a structured UPSC dict for a single article.
+    Keys returned (always):
+      - summary_en (str)
+      - summary_hi (str) -> "" (English only for now)
+      - prelims_points (list[str])
+      - mains_angles (list[str])
+      - interview_questions (list[str])
+      - schemes_acts_policies (list[str])
+      - institutions (list[str])
+      - dates (list[str])
+      - category (one of ALLOWED_CATEGORIES)
+    """
+    prompt_fmt = _build_prompt(article, mode)
+
+    # ---- Call LLM
+    try:
+        resp = llm.invoke(prompt_fmt)
+        raw = getattr(resp, "content", str(resp))
+    except Exception as e:
+        raw = ""
+
+    return _build_output(article, raw)
+
+async def auto_categorize_batch(
+    articles: List[Dict[str, Any]], llm, mode: str = "deep", concurrency: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Batched auto_categorize: fire the LLM calls concurrently (bounded by a
+    semaphore) and return one dict per article, in input order.
+    An article whose prompt/parse fails yields {} so callers can fall back.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _call(prompt: str) -> str:
+        async with sem:
+            try:
+                return await acomplete(prompt, llm)
+            except Exception:
+                return ""
+
+    async def _one(art: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            prompt = _build_prompt(art, mode)
+            return _build_output(art, await _call(prompt))
+        except Exception:
+            return {}
+
+    return list(await asyncio.gather(*(_one(a) for a in articles)))
@@ -0,0 +1,24 @@
+# utils/chunking.py
+"""
+Fixed-size character windows shared by the index builder and the PDF analyzer.
+- chunk_offsets(): (start, end) pairs from one range(); no per-window arithmetic in Python
+- A window is only emitted if the previous one didn't already reach the end
+  of the text, so short blocks no longer produce a redundant overlap-only tail
+"""
+
+from typing import List, Tuple
+
+
+def chunk_offsets(n: int, size: int, overlap: int) -> List[Tuple[int, int]]:
+    """(start, end) of each window of `size` chars, `overlap` chars shared, over a text of length n."""
+    if n <= 0:
+        return []
+    size = max(1, size)
+    step = max(1, size - overlap)
+    # last start whose predecessor still ended before n
+    stop = max(1, n - size + step)
+    return [(s, min(s + size, n)) for s in range(0, stop, step)]
+
+
+def chunk_text(text: str, size: int, overlap: int) -> List[str]:
+    return [text[s:e] for s, e in chunk_offsets(len(text), size, overlap)]
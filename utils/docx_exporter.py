@@ -7,7 +7,7 @@ Compatible with both PDF analysis and saved notes formats.
 from __future__ import annotations
 import io
 import re
-from typing import Dict, List, Any
+from typing import BinaryIO, Dict, List, Any
 from datetime import datetime
 
 try:
@@ -25,16 +25,27 @@ def _safe_filename(name: str) -> str:
     return name or f"notes_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
 
 
-def build_docx_from_notes(structured: Dict, title: str = "UPSC Notes") -> bytes:
+def _save_doc(doc, out_stream: BinaryIO | None) -> bytes | None:
+    """Save into the caller's stream if given, else return the bytes."""
+    if out_stream is not None:
+        doc.save(out_stream)
+        return None
+    bio = io.BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+
+def build_docx_from_notes(structured: Dict, title: str = "UPSC Notes", out_stream: BinaryIO | None = None) -> bytes | None:
     """
     Build a DOCX document from structured notes (PDF analyzer output).
     
     Args:
         structured: Dictionary containing grouped notes
         title: Document title
+        out_stream: Optional writable binary stream to save into directly
     
     Returns:
-        bytes: DOCX file as bytes
+        bytes: DOCX file as bytes (None when out_stream is given)
     """
     if not DOCX_AVAILABLE:
         raise ImportError("python-docx is required. Install with: pip install python-docx")
@@ -135,12 +146,7 @@ def build_docx_from_notes(structured: Dict, title: str = "UPSC Notes") -> bytes:
     footer_para.text = f"UNISOLE UPSC Notes | Generated: {timestamp}"
     footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     
-    # Save to bytes
-    bio = io.BytesIO()
-    doc.save(bio)
-    bio.seek(0)
-    
-    return bio.read()
+    return _save_doc(doc, out_stream)
 
 
 def export_notes_to_docx(
@@ -148,7 +154,8 @@ def export_notes_to_docx(
     cover: bool = True,
     language: str = "en",
     cover_title: str | None = None,
-) -> bytes:
+    out_stream: BinaryIO | None = None,
+) -> bytes | None:
     """
     Build a DOCX file from saved notes structure (API format).
     This handles the format from saved_notes.json.
@@ -158,9 +165,10 @@ def export_notes_to_docx(
         cover: Include cover page
         language: Language for summary (en/hi)
         cover_title: Custom cover title
+        out_stream: Optional writable binary stream to save into directly
     
     Returns:
-        bytes: DOCX file as bytes
+        bytes: DOCX file as bytes (None when out_stream is given)
     """
     if not DOCX_AVAILABLE:
         raise ImportError("python-docx is required. Install with: pip install python-docx")
@@ -244,8 +252,4 @@ def export_notes_to_docx(
     if meta:
         doc.add_paragraph("\n".join(meta))
 
-    # Save to bytes
-    bio = io.BytesIO()
-    doc.save(bio)
-    bio.seek(0)
-    return bio.read()
\ No newline at end of file
+    return _save_doc(doc, out_stream)
\ No newline at end of file
@@ -11,6 +11,8 @@ from functools import lru_cache
 import importlib
 from typing import Any, Optional
 
+from utils.llm_async import get_async_http_client
+
 # Set up logging
 logger = logging.getLogger(__name__)
 # Try to import Groq Chat; fall back to OpenAI if not available
@@ -40,11 +42,23 @@ except Exception as e:
     ChatOpenAI = None
 
 
+def _pooled_client_kwargs() -> dict:
+    """Share utils.llm_async's keep-alive AsyncClient with the chat model's async path."""
+    client = get_async_http_client()
+    return {"http_async_client": client} if client is not None else {}
+
+
 @lru_cache(maxsize=4)
 def get_llm(model_name: Optional[str] = None, provider: Optional[str] = None, temperature: float = 0.2) -> Any:
     """
     Return an LLM instance. Cached to avoid reinitialization across calls.
     provider: 'groq' or 'openai' (auto-detected from env if None)
+
+    One instance per (model_name, provider, temperature) per process. The
+    LangChain chat clients are stateless apart from their HTTP pool, so the
+    cached instance is safe to share across FastAPI's threadpool workers.
+    Failures are not cached (exceptions propagate), so a missing key is
+    retried on the next call.
     """
     logger.info("=== get_llm() called ===")
     
@@ -93,7 +107,8 @@ def get_llm(model_name: Optional[str] = None, provider: Optional[str] = None, te
             llm = ChatOpenAI(
                 temperature=temperature,
                 openai_api_key=openai_key,
-                model=model
+                model=model,
+                **_pooled_client_kwargs(),
             )
             logger.info("✅ ChatOpenAI created successfully")
             return llm
@@ -121,7 +136,8 @@ def get_llm(model_name: Optional[str] = None, provider: Optional[str] = None, te
                 llm = ChatOpenAI(
                     temperature=temperature,
                     openai_api_key=openai_key,
-                    model=model
+                    model=model,
+                    **_pooled_client_kwargs(),
                 )
                 logger.info("✅ ChatOpenAI created successfully (fallback)")
                 return llm
@@ -137,7 +153,8 @@ def get_llm(model_name: Optional[str] = None, provider: Optional[str] = None, te
             llm = ChatGroq(
                 api_key=groq_key,
                 model=model,
-                temperature=temperature
+                temperature=temperature,
+                **_pooled_client_kwargs(),
             )
             logger.info("✅ ChatGroq created successfully")
             return llm
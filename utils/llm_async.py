@@ -0,0 +1,58 @@
+# utils/llm_async.py
+"""
+Async side of the LLM factory.
+- One process-wide httpx.AsyncClient (keep-alive pool, HTTP/2 when `h2` is
+  installed) handed to ChatGroq / ChatOpenAI by utils.llm.get_llm, so every
+  async call shares TCP+TLS connections
+- acomplete(): await an LLM call without blocking the event loop
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+_MAX_KEEPALIVE = 32
+_MAX_CONNECTIONS = 64
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> Optional[Any]:
+    """Shared pooled AsyncClient, or None if httpx is missing (clients use their own)."""
+    if not HAS_HTTPX:
+        return None
+    return httpx.AsyncClient(
+        http2=HAS_H2,
+        limits=httpx.Limits(max_keepalive_connections=_MAX_KEEPALIVE, max_connections=_MAX_CONNECTIONS),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+
+
+async def acomplete(prompt: Any, llm=None) -> str:
+    """
+    Await one completion and return its text.
+    Uses llm.ainvoke when the model has it; sync-only models run in a thread.
+    Exceptions propagate so callers keep their own fallbacks.
+    """
+    if llm is None:
+        from utils.llm import get_llm
+        llm = get_llm()
+    if hasattr(llm, "ainvoke"):
+        resp = await llm.ainvoke(prompt)
+    else:
+        resp = await asyncio.to_thread(llm.invoke, prompt)
+    return getattr(resp, "content", str(resp))
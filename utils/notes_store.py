@@ -0,0 +1,420 @@
+# utils/notes_store.py
+"""
+Saved-notes store shared by the /notes and /export routes.
+- One JSON file per date (data/notes/YYYY-MM-DD.json), so a request only
+  reads/parses/writes the day it is about
+- Each day's list is cached in-process and only re-read when its file changes on disk
+- All access goes through an RLock (FastAPI runs sync endpoints in a threadpool)
+- Async variants (aget_day / aapply_op) do their disk I/O via aiofiles
+- Writes re-read the day under a per-date fcntl.flock and replace it from a
+  per-writer temp file, so several API workers / the Streamlit app can save
+  to the same date without losing notes
+- migrate_legacy_notes() splits the old single saved_notes.json (+ .jsonl op log)
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.config import DATA_DIR
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import aiofiles
+    HAS_AIOFILES = True
+except ImportError:
+    HAS_AIOFILES = False
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows: single-process locking only
+    HAS_FCNTL = False
+
+SAVED_NOTES_DIR = os.path.join(DATA_DIR, "notes")
+os.makedirs(SAVED_NOTES_DIR, exist_ok=True)
+
+# Pre-shard layout, only read by migrate_legacy_notes()
+LEGACY_NOTES_PATH = os.path.join(DATA_DIR, "saved_notes.json")
+LEGACY_NOTES_LOG_PATH = os.path.join(DATA_DIR, "saved_notes.jsonl")
+
+# Dates become file names, so only allow plain tokens like 2025-01-31
+_SAFE_DATE = re.compile(r"[A-Za-z0-9_-]{1,40}")
+
+notes_lock = threading.RLock()
+notes_alock = asyncio.Lock()  # serializes async writers across their awaits
+# date -> (file signature, notes, {(title, url)} for O(1) dedupe)
+_cache: Dict[str, Tuple[Optional[Tuple], List[dict], Set[Tuple]]] = {}
+
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    if HAS_ORJSON:
+        opt = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=opt)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def _shard_path(date: str) -> Optional[str]:
+    """data/notes/<date>.json, or None if the date is not a safe file name."""
+    if not date or not _SAFE_DATE.fullmatch(date):
+        return None
+    return os.path.join(SAVED_NOTES_DIR, f"{date}.json")
+
+
+def _stat_sig(path: Optional[str]) -> Optional[Tuple]:
+    """Cheap change detector: (mtime_ns, size) of a shard."""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def notes_etag(date: str, *parts) -> str:
+    """
+    Quoted ETag for a response derived from one date's notes.
+    Changes whenever that date's file changes on disk.
+    """
+    key = ":".join(str(p) for p in (date, *parts, _stat_sig(_shard_path(date))))
+    return '"%s"' % hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers this ETag."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def note_matches(x: dict, title: Optional[str], url: Optional[str]) -> bool:
+    """Match priority: title+url > title only > url only."""
+    if title and url:
+        return x.get("title") == title and x.get("url") == url
+    if title:
+        return x.get("title") == title
+    if url:
+        return x.get("url") == url
+    return False  # nothing to remove
+
+
+def _note_key(x: dict) -> Tuple:
+    return (x.get("title"), x.get("url"))
+
+
+def _apply(data: Dict[str, List[dict]], index: Dict[str, Set[Tuple]], rec: dict) -> None:
+    """Apply one op record onto a {date: notes} dict + key index (idempotent)."""
+    op, date = rec.get("op"), rec.get("date")
+    if not date:
+        return
+    if op in ("add", "add_many"):
+        notes = [rec.get("note") or {}] if op == "add" else rec.get("notes") or []
+        keys = index.setdefault(date, set())
+        for note in notes:
+            key = _note_key(note)
+            if key not in keys:
+                data.setdefault(date, []).append(note)
+                keys.add(key)
+    elif op == "delete_day":
+        data.pop(date, None)
+        index.pop(date, None)
+    elif op == "delete_one":
+        title, url = rec.get("title"), rec.get("url")
+        data[date] = [x for x in data.get(date, []) if not note_matches(x, title, url)]
+        index[date] = {_note_key(x) for x in data[date]}
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+async def _aread_bytes(path: str) -> Optional[bytes]:
+    if not HAS_AIOFILES:
+        return await asyncio.to_thread(_read_bytes, path)
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+    except OSError:
+        return None
+
+
+def _parse_day(raw: Optional[bytes]) -> List[dict]:
+    if not raw:
+        return []
+    try:
+        items = _loads(raw)
+    except Exception:
+        return []
+    return items if isinstance(items, list) else []
+
+
+def _remember(date: str, sig: Optional[Tuple], items: List[dict]) -> List[dict]:
+    _cache[date] = (sig, items, {_note_key(x) for x in items})
+    return items
+
+
+def _cached(date: str, sig: Optional[Tuple]) -> Optional[List[dict]]:
+    hit = _cache.get(date)
+    return hit[1] if hit is not None and hit[0] == sig else None
+
+
+def get_day(date: str) -> List[dict]:
+    """
+    Return the notes saved for one date ([] if none).
+    One os.stat on a cache hit; the shard is re-read only when it changed.
+    Callers must treat the result as read-only.
+    """
+    path = _shard_path(date)
+    if path is None:
+        return []
+    with notes_lock:
+        sig = _stat_sig(path)
+        items = _cached(date, sig)
+        if items is None:
+            items = _remember(date, sig, _parse_day(_read_bytes(path)))
+        return items
+
+
+async def aget_day(date: str) -> List[dict]:
+    """get_day() for async routes: cache hits stay on the loop, reloads read via aiofiles."""
+    path = _shard_path(date)
+    if path is None:
+        return []
+    with notes_lock:
+        sig = _stat_sig(path)
+        items = _cached(date, sig)
+        if items is not None:
+            return items
+    items = _parse_day(await _aread_bytes(path))
+    with notes_lock:
+        return _remember(date, sig, items)
+
+
+def list_days() -> List[str]:
+    """Dates that have a notes file, newest first."""
+    try:
+        names = os.listdir(SAVED_NOTES_DIR)
+    except OSError:
+        return []
+    days = (n[:-5] for n in names if n.endswith(".json"))
+    return sorted((d for d in days if _SAFE_DATE.fullmatch(d)), reverse=True)
+
+
+def day_exists(date: str) -> bool:
+    path = _shard_path(date)
+    return path is not None and os.path.exists(path)
+
+
+def has_note(date: str, title: Optional[str], url: Optional[str]) -> bool:
+    """O(1) duplicate check on (title, url) within a date."""
+    with notes_lock:
+        get_day(date)
+        hit = _cache.get(date)
+        return hit is not None and (title, url) in hit[2]
+
+
+def _lock_day(path: str) -> Optional[int]:
+    """Blocking cross-process exclusive lock on <date>.lock; returns its fd."""
+    if not HAS_FCNTL:
+        return None
+    fd = os.open(path[:-len(".json")] + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _unlock_day(fd: Optional[int]) -> None:
+    if fd is not None:
+        os.close(fd)  # closing the descriptor releases the flock
+
+
+@contextmanager
+def _day_locked(path: str):
+    fd = _lock_day(path)
+    try:
+        yield
+    finally:
+        _unlock_day(fd)
+
+
+def _mkstemp_for(path: str) -> Tuple[int, str]:
+    """Private temp file next to the shard (same filesystem, so os.replace is atomic)."""
+    return tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+
+
+def _discard(tmp: str) -> None:
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+
+
+def _write_shard(path: str, items: List[dict]) -> None:
+    """
+    Single buffered write to a temp file, fsync, then atomic rename so
+    readers never see a half-written day.
+    """
+    fd, tmp = _mkstemp_for(path)
+    try:
+        with os.fdopen(fd, "wb", buffering=1 << 16) as f:
+            f.write(_dumps(items, indent=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        _discard(tmp)
+        raise
+
+
+async def _awrite_shard(path: str, items: List[dict]) -> None:
+    if not HAS_AIOFILES:
+        return await asyncio.to_thread(_write_shard, path, items)
+    fd, tmp = _mkstemp_for(path)
+    os.close(fd)
+    try:
+        async with aiofiles.open(tmp, "wb") as f:
+            await f.write(_dumps(items, indent=True))
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        _discard(tmp)
+        raise
+
+
+def _remove_shard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _next_items(date: str, current: List[dict], record: dict) -> Optional[List[dict]]:
+    """Result of applying an op to one day's list; None means delete the file."""
+    data, index = {date: list(current)}, {date: {_note_key(x) for x in current}}
+    _apply(data, index, {**record, "date": date})
+    return data.get(date)
+
+
+def apply_op(record: dict) -> None:
+    """Apply one op ({"op": add|add_many|delete_day|delete_one, "date": ...}) to its date's file."""
+    date = record.get("date")
+    path = _shard_path(date)
+    if path is None:
+        raise ValueError(f"Invalid date: {date!r}")
+    with notes_lock, _day_locked(path):
+        # Fresh read under the lock: another process may have just written this day
+        items = _next_items(date, _parse_day(_read_bytes(path)), record)
+        if items is None:
+            _remove_shard(path)
+            _cache.pop(date, None)
+        else:
+            _write_shard(path, items)
+            _remember(date, _stat_sig(path), items)
+
+
+def _unlock_when_acquired(task: "asyncio.Future") -> None:
+    """Done-callback for a _lock_day() whose awaiter was cancelled."""
+    if not task.cancelled() and task.exception() is None:
+        _unlock_day(task.result())
+
+
+async def aapply_op(record: dict) -> None:
+    """
+    apply_op() for async routes. Takes the day's file lock only; callers hold
+    notes_alock themselves around their check-then-apply.
+    """
+    date = record.get("date")
+    path = _shard_path(date)
+    if path is None:
+        raise ValueError(f"Invalid date: {date!r}")
+    # The flock can wait on another worker, so take it off the event loop. The
+    # thread can't be interrupted: if we are cancelled while it waits, it still
+    # gets the lock, and the callback releases it.
+    acquire = asyncio.ensure_future(asyncio.to_thread(_lock_day, path))
+    try:
+        fd = await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        acquire.add_done_callback(_unlock_when_acquired)
+        raise
+    try:
+        items = _next_items(date, _parse_day(await _aread_bytes(path)), record)
+        if items is None:
+            await asyncio.to_thread(_remove_shard, path)
+            with notes_lock:
+                _cache.pop(date, None)
+        else:
+            await _awrite_shard(path, items)
+            with notes_lock:
+                _remember(date, _stat_sig(path), items)
+    finally:
+        _unlock_day(fd)
+
+
+def migrate_legacy_notes() -> int:
+    """
+    One-shot split of the old saved_notes.json (+ saved_notes.jsonl op log)
+    into per-date files. Dates that already have a file are left alone; the
+    legacy files are renamed to *.migrated afterwards. Returns days written.
+    """
+    with notes_lock:
+        snap = _read_bytes(LEGACY_NOTES_PATH)
+        log = _read_bytes(LEGACY_NOTES_LOG_PATH)
+        if snap is None and log is None:
+            return 0
+
+        data: Dict[str, List[dict]] = {}
+        if snap:
+            try:
+                data = _loads(snap)
+            except Exception:
+                data = {}
+        index = {d: {_note_key(x) for x in items} for d, items in data.items() if isinstance(items, list)}
+        for line in (log or b"").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                _apply(data, index, _loads(line))
+            except Exception:
+                continue  # skip a torn/partial trailing line
+
+        written = 0
+        for date, items in data.items():
+            path = _shard_path(date)
+            if path is None or not isinstance(items, list):
+                continue
+            with _day_locked(path):
+                if os.path.exists(path):
+                    continue
+                _write_shard(path, items)
+            written += 1
+
+        for legacy in (LEGACY_NOTES_PATH, LEGACY_NOTES_LOG_PATH):
+            if os.path.exists(legacy):
+                os.replace(legacy, legacy + ".migrated")
+        return written
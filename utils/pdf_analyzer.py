@@ -42,6 +42,7 @@ from utils.config import UPSC_CATEGORIES
 
 # Import from our unified pdf_reader module
 from utils.pdf_reader import extract_pdf_text_bytes
+from utils.chunking import chunk_text as _chunk_text
 
 JSON_SCHEMA_EXAMPLE = {
   "items": [
@@ -99,14 +100,7 @@ TEXT CHUNK:
 """)
 
 def chunk_text(s: str, size: int = 6000, overlap: int = 300) -> List[str]:
-    out = []
-    i = 0
-    n = len(s)
-    step = max(1, size - overlap)
-    while i < n:
-        out.append(s[i:i+size])
-        i += step
-    return out
+    return _chunk_text(s, size, overlap)
 
 def _norm_title(t: str) -> str:
     return (t or "").strip().lower()[:120]
@@ -1,26 +1,46 @@
 """
 Enhanced PDF Reader with conditional OCR.
-- Uses fitz (PyMuPDF) or PyPDF2 for text extraction
+- Uses zpdf when installed (mmap, zero-copy), else fitz (PyMuPDF) or PyPDF2 for text extraction
 - Falls back to OCR (pdf2image + pytesseract) if text < 100 chars total
 - Excludes image-only pages and junk text
 - Splits into UPSC-ready sections
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import io
 import os
+import asyncio
 import logging
 import re
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+
+from utils.llm import get_llm
+from utils.llm_async import acomplete
+from utils.summary_cache import get_summary, set_summary, summary_key, model_name_of
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zpdf  # optional; currently arm64 wheels only
+    HAS_ZPDF = True
+except ImportError:
+    HAS_ZPDF = False
+
 try:
     import fitz  # PyMuPDF
     HAS_FITZ = True
 except ImportError:
     HAS_FITZ = False
 
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
 try:
     from PyPDF2 import PdfReader
     HAS_PYPDF2 = True
@@ -41,6 +61,10 @@ except ImportError:
 
 # ---------- Helper functions ----------
 
+# Compiled once at import instead of re-resolved on every call / sentence
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
 def _normalize_text(text: str) -> str:
     """Clean and normalize extracted text."""
     if not text:
@@ -58,7 +82,7 @@ def sentence_tokenize(text: str) -> List[str]:
         return []
     
     # Split on sentence-ending punctuation followed by space or end of string
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     
     # Clean up and filter out empty sentences
     sentences = [s.strip() for s in sentences if s.strip()]
@@ -80,7 +104,7 @@ def tfidf_summarize(text: str, num_sentences: int = 5) -> str:
         return text
     
     # Calculate word frequencies (simple TF)
-    words = re.findall(r'\b\w+\b', text.lower())
+    words = _WORD_RE.findall(text.lower())
     word_freq = {}
     for word in words:
         if len(word) > 3:  # Ignore very short words
@@ -89,7 +113,7 @@ def tfidf_summarize(text: str, num_sentences: int = 5) -> str:
     # Score each sentence based on word frequencies
     sentence_scores = {}
     for i, sentence in enumerate(sentences):
-        sentence_words = re.findall(r'\b\w+\b', sentence.lower())
+        sentence_words = _WORD_RE.findall(sentence.lower())
         score = sum(word_freq.get(word, 0) for word in sentence_words if len(word) > 3)
         if score > 0:
             sentence_scores[i] = score / len(sentence_words)  # Normalize by length
@@ -104,29 +128,33 @@ def tfidf_summarize(text: str, num_sentences: int = 5) -> str:
 
 # ---------- Extraction Methods ----------
 
-def extract_with_fitz(pdf_bytes: bytes) -> str:
-    """Extract text with PyMuPDF."""
+def _fitz_text(pdf_bytes: bytes) -> Tuple[str, int]:
+    """PyMuPDF -> (text, num_pages); pages normalized and newline-joined."""
     if not HAS_FITZ:
         raise RuntimeError("PyMuPDF not installed")
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    pages = []
-    for page in doc:
-        txt = page.get_text("text") or ""
-        pages.append(_normalize_text(txt))
-    doc.close()
-    return "\n".join(pages)
+    try:
+        return "\n".join(_normalize_text(page.get_text("text") or "") for page in doc), len(doc)
+    finally:
+        doc.close()
 
 
-def extract_with_pypdf2(pdf_bytes: bytes) -> str:
-    """Extract text with PyPDF2."""
+def _pypdf2_text(pdf_bytes: bytes) -> Tuple[str, int]:
+    """PyPDF2 -> (text, num_pages); pages normalized and newline-joined."""
     if not HAS_PYPDF2:
         raise RuntimeError("PyPDF2 not installed")
     reader = PdfReader(io.BytesIO(pdf_bytes))
-    texts = []
-    for page in reader.pages:
-        t = page.extract_text() or ""
-        texts.append(_normalize_text(t))
-    return "\n".join(texts)
+    return "\n".join(_normalize_text(page.extract_text() or "") for page in reader.pages), len(reader.pages)
+
+
+def extract_with_fitz(pdf_bytes: bytes) -> str:
+    """Extract text with PyMuPDF."""
+    return _fitz_text(pdf_bytes)[0]
+
+
+def extract_with_pypdf2(pdf_bytes: bytes) -> str:
+    """Extract text with PyPDF2."""
+    return _pypdf2_text(pdf_bytes)[0]
 
 
 def extract_with_ocr(pdf_bytes: bytes, dpi: int = 150) -> str:
@@ -192,7 +220,8 @@ def extract_pdf_text_bytes(pdf_bytes, enable_ocr: bool = True):
     """
     Main entry: extract text; fallback to OCR if too short.
     Accepts: bytes, bytearray, file path (str), file-like object, or already-extracted text
-    Returns: (raw_text, num_pages, method_used)
+    (fitz / PyPDF2 / OCR also take the memoryview used for in-memory uploads)
+    Returns: (raw_text: str, num_pages: int, method_used: str) -- always this 3-tuple
     """
     # Normalize input to bytes
     if isinstance(pdf_bytes, str):
@@ -219,31 +248,35 @@ def extract_pdf_text_bytes(pdf_bytes, enable_ocr: bool = True):
     elif isinstance(pdf_bytes, bytearray):
         pdf_bytes = bytes(pdf_bytes)
     elif hasattr(pdf_bytes, 'read'):
-        # File-like object
-        content = pdf_bytes.read()
+        # File-like object; in-memory uploads are viewed in place, not copied
+        content = _pdf_data(pdf_bytes)
         if isinstance(content, str):
             # File object returned string (already extracted text)
             estimated_pages = max(1, len(content) // 3000)
             return content, estimated_pages, "pre-extracted"
         pdf_bytes = bytes(content) if isinstance(content, bytearray) else content
-    elif not isinstance(pdf_bytes, bytes):
+    elif not isinstance(pdf_bytes, (bytes, memoryview)):
         raise TypeError(f"Expected bytes, str (filepath), or file-like object, got {type(pdf_bytes)}")
     
     text = ""
     num_pages = 0
     method = "none"
 
-    # 1. Try fitz first (best)
-    if HAS_FITZ:
+    # 1. zpdf when available (fastest); any parse error falls through to fitz
+    if HAS_ZPDF:
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            num_pages = len(doc)
-            pages = []
-            for page in doc:
-                txt = page.get_text("text") or ""
-                pages.append(_normalize_text(txt))
-            doc.close()
-            text = "\n".join(pages)
+            with zpdf.Document(pdf_bytes) as doc:
+                text = _normalize_text(doc.extract_all())
+                num_pages = doc.page_count
+            method = "zpdf"
+        except Exception as e:
+            logger.warning(f"zpdf failed: {e}")
+            text = ""
+
+    # 1b. fitz (best of the always-available backends)
+    if HAS_FITZ and len(text.strip()) < 100:
+        try:
+            text, num_pages = _fitz_text(pdf_bytes)
             method = "fitz"
         except Exception as e:
             logger.warning(f"fitz failed: {e}")
@@ -251,13 +284,7 @@ def extract_pdf_text_bytes(pdf_bytes, enable_ocr: bool = True):
     # 2. Fallback to PyPDF2
     if not text or len(text.strip()) < 100:
         try:
-            reader = PdfReader(io.BytesIO(pdf_bytes))
-            num_pages = len(reader.pages)
-            texts = []
-            for page in reader.pages:
-                t = page.extract_text() or ""
-                texts.append(_normalize_text(t))
-            text = "\n".join(texts)
+            text, num_pages = _pypdf2_text(pdf_bytes)
             method = "pypdf2"
         except Exception as e:
             logger.warning(f"PyPDF2 failed: {e}")
@@ -278,6 +305,171 @@ def extract_pdf_text_bytes(pdf_bytes, enable_ocr: bool = True):
     return text, num_pages, method
 
 
+# ---------- Parallel extraction (large PDFs) ----------
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 8
+_worker_pdf = None  # set in each pool worker by _init_page_worker
+
+
+def _init_page_worker(pdf_data) -> None:
+    global _worker_pdf
+    _worker_pdf = pdf_data
+
+
+def _page_range_text(start: int, stop: int) -> List[str]:
+    """Pool worker: open the worker's copy of the PDF once and read pages [start, stop)."""
+    doc = fitz.open(stream=_worker_pdf, filetype="pdf")
+    try:
+        return [_normalize_text(doc[i].get_text("text") or "") for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _ocr_page(pdf_data, page_no: int, dpi: int) -> str:
+    """OCR one 1-based page; only that page is rasterized."""
+    try:
+        pages = convert_from_bytes(pdf_data, dpi=dpi, first_page=page_no, last_page=page_no)
+        texts = []
+        for img in pages:
+            img.thumbnail((1600, 1600), Image.Resampling.LANCZOS)
+            text = _normalize_text(pytesseract.image_to_string(img, lang="eng"))
+            if len(text) > 100:
+                texts.append(text)
+        return "\n".join(texts)
+    except Exception as e:
+        logger.warning(f"OCR failed on page {page_no}: {e}")
+        return ""
+
+
+def extract_with_ocr_parallel(pdf_data, num_pages: int, workers: int, dpi: int = 150) -> str:
+    """
+    extract_with_ocr with up to `workers` pages in flight. pytesseract runs the
+    tesseract binary in a subprocess, so threads give real parallelism; at most
+    `workers` page images are held at once. Same 20-page cap as extract_with_ocr.
+    """
+    if not HAS_OCR:
+        raise RuntimeError("OCR dependencies not installed (pdf2image, pytesseract, Pillow)")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        texts = pool.map(lambda n: _ocr_page(pdf_data, n, dpi), range(1, min(num_pages, 20) + 1))
+        return "\n".join(t for t in texts if t)
+
+
+def _pdf_data(pdf_source):
+    """
+    Bytes-like view of a PDF source for fitz.open(stream=...).
+    In-memory uploads (BytesIO / Streamlit UploadedFile, and a
+    SpooledTemporaryFile that hasn't rolled to disk) are used in place;
+    other file-likes are read from their current position.
+    """
+    if isinstance(pdf_source, bytearray):
+        return bytes(pdf_source)
+    if not hasattr(pdf_source, "read"):
+        return pdf_source
+    buf = pdf_source if hasattr(pdf_source, "getbuffer") else getattr(pdf_source, "_file", None)
+    if hasattr(buf, "getbuffer") and pdf_source.tell() == 0:
+        return buf.getbuffer()
+    return pdf_source.read()
+
+
+def extract_pdf_text_bytes_parallel(pdf_bytes, workers: Optional[int] = None, enable_ocr: bool = False):
+    """
+    extract_pdf_text_bytes for multi-page PDFs: pages are split into one
+    contiguous range per worker process, each worker opens the document once,
+    and the texts are reassembled in page order. OCR (if needed and enabled)
+    runs pages concurrently. Small PDFs, non-PDF input and environments
+    without PyMuPDF take the sequential path.
+    Returns the same (raw_text, num_pages, method) 3-tuple.
+    """
+    workers = workers or min(os.cpu_count() or 1, 6)
+    if isinstance(pdf_bytes, str) or not HAS_FITZ or workers < 2:
+        return extract_pdf_text_bytes(pdf_bytes, enable_ocr=enable_ocr)
+    data = _pdf_data(pdf_bytes)
+
+    num_pages = pdf_page_count(data)
+    if not num_pages or num_pages < PARALLEL_MIN_PAGES:
+        return extract_pdf_text_bytes(data, enable_ocr=enable_ocr)
+
+    workers = min(workers, num_pages)
+    step = -(-num_pages // workers)
+    starts = range(0, num_pages, step)
+    try:
+        # Workers inherit the document through the initializer (no per-task pickling);
+        # bytes, not a memoryview, so spawn/forkserver can pickle it
+        with ProcessPoolExecutor(max_workers=len(starts), initializer=_init_page_worker, initargs=(bytes(data),)) as pool:
+            pages = list(chain.from_iterable(
+                pool.map(_page_range_text, starts, [min(s + step, num_pages) for s in starts])
+            ))
+    except Exception as e:
+        logger.warning(f"Parallel extraction failed, using sequential path: {e}")
+        return extract_pdf_text_bytes(data, enable_ocr=enable_ocr)
+
+    text = "\n".join(pages)
+    if len(text.strip()) >= 100:
+        return text, num_pages, "fitz-parallel"
+
+    if enable_ocr and HAS_OCR:
+        logger.info("Text content too short — running parallel OCR fallback...")
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=Image.DecompressionBombWarning)
+                text = extract_with_ocr_parallel(data, num_pages, workers, dpi=150)
+            return text, num_pages, "ocr-parallel"
+        except Exception as e:
+            logger.error(f"OCR failed: {e}")
+    # Nothing usable from fitz: let the sequential path try its other backends
+    return extract_pdf_text_bytes(data, enable_ocr=False)
+
+
+def pdf_page_count(pdf_source) -> Optional[int]:
+    """
+    Page count from the xref/page tree only (no text extraction), or None if it
+    can't be determined (no PyMuPDF, unreadable file). File-likes keep their position.
+    """
+    if not HAS_FITZ:
+        return None
+    try:
+        pos = pdf_source.tell() if hasattr(pdf_source, "read") else None
+        data = _pdf_data(pdf_source)
+        if pos is not None:
+            pdf_source.seek(pos)
+        doc = fitz.open(stream=data, filetype="pdf")
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+    except Exception as e:
+        logger.warning(f"Page-count precheck failed: {e}")
+        return None
+
+
+def extract_pdf_pages_iter(pdf_source, chunk_size: int = 100) -> Iterator[Tuple[Tuple[int, int], str]]:
+    """
+    Yield ((first_page, last_page), text) for every chunk_size pages (PyMuPDF only).
+    Text is normalized per page and joined with newlines like extract_pdf_text_bytes;
+    each chunk is dropped (and gc'd) before the next is built.
+    Accepts bytes, bytearray, file path or a binary file-like object.
+    """
+    if not HAS_FITZ:
+        raise RuntimeError("PyMuPDF not installed")
+    import gc
+
+    if isinstance(pdf_source, str):
+        doc = fitz.open(pdf_source)
+    else:
+        doc = fitz.open(stream=_pdf_data(pdf_source), filetype="pdf")
+    try:
+        total = len(doc)
+        for start in range(0, total, chunk_size):
+            end = min(start + chunk_size, total)
+            texts = [_normalize_text(doc.load_page(i).get_text("text") or "") for i in range(start, end)]
+            yield (start, end - 1), "\n".join(texts)
+            del texts
+            gc.collect()
+    finally:
+        doc.close()
+
+
 # ---------- Section splitting ----------
 
 def validate_sections(sections: Any) -> List[Dict[str, Any]]:
@@ -303,42 +495,79 @@ def validate_sections(sections: Any) -> List[Dict[str, Any]]:
     return []
 
 
-def split_into_sections(raw_text: str, min_chars: int = 100) -> List[Dict[str, Any]]:
-    """Split into sections and remove junk under 100 chars."""
-    if not raw_text or not raw_text.strip():
-        return []
+_SECTION_CHUNK = 3000    # split roughly by 2–3K characters
+_SECTION_OVERLAP = 200
+
 
-    # Split roughly by 2–3K characters
-    chunk_size = 3000
-    overlap = 200
-    text = raw_text.strip()
-    sections = []
-
-    start = 0
-    idx = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end].strip()
+def split_into_sections_iter(texts: Iterable[str], min_chars: int = 100) -> List[Dict[str, Any]]:
+    """
+    split_into_sections() over text that arrives in pieces (e.g. page chunks from
+    extract_pdf_pages_iter). Only the not-yet-sectioned tail is buffered, so the
+    whole document never has to exist as one string.
+    """
+    sections: List[Dict[str, Any]] = []
+    step = _SECTION_CHUNK - _SECTION_OVERLAP
+    buf = ""
+    pos = 0  # windows advance by offset; buf is only compacted once per piece
+    started = False
+
+    def _emit(start: int) -> None:
+        chunk = buf[start:start + _SECTION_CHUNK].strip()
         if len(chunk) >= min_chars:
-            sections.append({
-                "title": f"Section {idx + 1}",
-                "text": chunk,
-                "index": idx
-            })
-            idx += 1
-        start = end - overlap
+            idx = len(sections)
+            sections.append({"title": f"Section {idx + 1}", "text": chunk, "index": idx})
+
+    for piece in texts:
+        if not piece:
+            continue
+        if not started:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+            started = True
+        buf = buf[pos:] + piece
+        pos = 0
+        # Only cut windows that can't change once more text arrives
+        while len(buf) - pos > _SECTION_CHUNK:
+            _emit(pos)
+            pos += step
+
+    buf = buf[pos:].rstrip()
+    tail = buf
+    for pos in range(0, len(buf), step):
+        _emit(pos)
 
     # If no sections were created, create at least one
-    if not sections and len(text) >= min_chars:
-        sections.append({
-            "title": "Section 1",
-            "text": text,
-            "index": 0
-        })
+    if not sections and len(tail) >= min_chars:
+        sections.append({"title": "Section 1", "text": tail, "index": 0})
 
     return sections
 
 
+def split_pdf_into_sections(pdf_source, min_chars: int = 100, chunk_size: int = 100) -> List[Dict[str, Any]]:
+    """
+    Page-chunked extract + split: same sections as
+    split_into_sections(extract_pdf_text_bytes(...)[0]) for the fitz path, without
+    ever holding the full document text. No OCR/PyPDF2 fallback ([] on failure).
+    """
+    def _texts():
+        for n, (_, text) in enumerate(extract_pdf_pages_iter(pdf_source, chunk_size=chunk_size)):
+            yield text if n == 0 else "\n" + text
+
+    try:
+        return split_into_sections_iter(_texts(), min_chars=min_chars)
+    except Exception as e:
+        logger.warning(f"Page-chunked extraction failed: {e}")
+        return []
+
+
+def split_into_sections(raw_text: str, min_chars: int = 100) -> List[Dict[str, Any]]:
+    """Split into sections and remove junk under 100 chars."""
+    if not raw_text or not raw_text.strip():
+        return []
+    return split_into_sections_iter([raw_text], min_chars=min_chars)
+
+
 # ---------- Backward compatibility aliases ----------
 
 def extract_text_from_pdf(pdf_source, enable_ocr: bool = True) -> str:
@@ -355,6 +584,28 @@ def extract_text_from_pdf(pdf_source, enable_ocr: bool = True) -> str:
     """
     text, num_pages, method = extract_pdf_text_bytes(pdf_source, enable_ocr=enable_ocr)
     return text
+
+
+
+def extract_texts_from_pdfs(paths: List[str], workers: Optional[int] = None, enable_ocr: bool = True) -> List[str]:
+    """
+    extract_text_from_pdf for many files at once, one worker process per PDF
+    (only the paths and texts cross process boundaries). Results keep the
+    order of paths; a single file, or a pool that fails to start, runs in-process.
+    """
+    workers = min(workers or min(os.cpu_count() or 1, 6), len(paths))
+    if workers < 2:
+        return [extract_text_from_pdf(p, enable_ocr=enable_ocr) for p in paths]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(partial(extract_text_from_pdf, enable_ocr=enable_ocr), paths))
+    except Exception as e:
+        logger.warning(f"Parallel PDF extraction failed, using sequential path: {e}")
+        return [extract_text_from_pdf(p, enable_ocr=enable_ocr) for p in paths]
+
+# ---------- Section summaries ----------
+
+def summarize_sections(sections: Any) -> List[Dict[str, Any]]:
     """
     Dummy summarizer (replace with LLM call later).
     Handles both list of dicts and single dict inputs.
@@ -398,4 +649,184 @@ def extract_text_from_pdf(pdf_source, enable_ocr: bool = True) -> str:
             "index": s.get("index", idx)
         })
     
-    return output
\ No newline at end of file
+    return output
+
+
+# Per-section token budget sent to the LLM, and the prompt budget per request
+# (~12k tokens); more sections than that -> another batch.
+_SECTION_TOKENS = {"fast": 400, "deep": 1000}
+_BATCH_MAX_TOKENS = 12000
+_CHARS_PER_TOKEN = 4  # estimate used when tiktoken / its BPE file is unavailable
+# Below these lengths the extractive summary is kept and no LLM call is made:
+# the section is already summary-sized (or, in fast mode, not worth a round-trip).
+_MIN_LLM_CHARS = 300
+_MIN_LLM_CHARS_FAST = 1000
+_SUMMARY_SPLIT = re.compile(r"===SUMMARY (\d+)===")
+
+
+def _batch_prompt(batch: List[Tuple[int, str]], mode: str) -> str:
+    length = "2-3 sentences" if mode == "fast" else "4-6 sentences"
+    parts = [
+        "You are a UPSC mentor. Summarize each section below for UPSC preparation "
+        f"in {length}, focusing on facts, schemes, institutions and exam relevance.\n"
+        "For every ===SECTION n=== block, reply with a ===SUMMARY n=== line followed by "
+        "its summary. Keep the same n, cover every section, add nothing else.\n"
+    ]
+    for i, snippet in batch:
+        parts.append(f"===SECTION {i + 1}===\n{snippet}\n")
+    return "\n".join(parts)
+
+
+def _parse_batch_summaries(raw: str) -> Dict[int, str]:
+    """'===SUMMARY n=== text ...' blocks -> {n - 1: text}."""
+    parts = _SUMMARY_SPLIT.split(raw or "")
+    out = {}
+    for n, body in zip(parts[1::2], parts[2::2]):
+        body = body.strip()
+        if body:
+            out[int(n) - 1] = body
+    return out
+
+
+_encoding = None
+
+
+def _get_encoding():
+    """cl100k_base, loaded once; None if tiktoken or its BPE file is unavailable."""
+    global _encoding
+    if _encoding is None:
+        _encoding = False
+        if HAS_TIKTOKEN:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+    return _encoding or None
+
+
+def _clip_tokens(text: str, n_tokens: int) -> Tuple[str, int]:
+    """First n_tokens tokens of text -> (snippet, token count). One encode per call."""
+    enc = _get_encoding()
+    if enc is None:
+        snippet = text[:n_tokens * _CHARS_PER_TOKEN]
+        return snippet, -(-len(snippet) // _CHARS_PER_TOKEN)
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= n_tokens:
+        return text, len(ids)
+    return enc.decode(ids[:n_tokens]), n_tokens
+
+
+def _needs_llm(item: Dict[str, Any], mode: str) -> bool:
+    n = len(item["text"])
+    return n >= (_MIN_LLM_CHARS_FAST if mode == "fast" else _MIN_LLM_CHARS)
+
+
+def _fill_from_cache(out: List[Dict[str, Any]], mode: str, llm) -> Dict[int, Tuple[str, str, int]]:
+    """
+    Token-clip each section once and apply cached summaries in place.
+    Returns {index: (cache key, snippet, tokens)} still to summarize.
+    """
+    model = model_name_of(llm)
+    budget = _SECTION_TOKENS.get(mode, _SECTION_TOKENS["deep"])
+    pending = {}
+    for i, item in enumerate(out):
+        if not _needs_llm(item, mode):
+            continue
+        snippet, n_tokens = _clip_tokens(item["text"], budget)
+        key = summary_key("pdf_section", mode, model, snippet)
+        cached = get_summary(key)
+        if cached:
+            item["summary"] = cached
+        else:
+            pending[i] = (key, snippet, n_tokens)
+    return pending
+
+
+def _plan_batches(pending: Dict[int, Tuple[str, str, int]]) -> List[List[Tuple[int, str]]]:
+    """Greedy-pack (index, snippet) pairs into prompts under _BATCH_MAX_TOKENS."""
+    batches: List[List[Tuple[int, str]]] = []
+    batch: List[Tuple[int, str]] = []
+    size = 0
+    for i, (_, snippet, n_tokens) in pending.items():
+        if batch and size + n_tokens > _BATCH_MAX_TOKENS:
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append((i, snippet))
+        size += n_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _merge_summaries(out: List[Dict[str, Any]], batch: List[Tuple[int, str]], resp, pending) -> None:
+    summaries = _parse_batch_summaries(getattr(resp, "content", str(resp)))
+    for i, _ in batch:
+        if i in summaries:
+            out[i]["summary"] = summaries[i]
+            set_summary(pending[i][0], summaries[i])
+
+
+def summarize_sections_groq(sections: Any, mode: str = "deep", llm=None) -> List[Dict[str, Any]]:
+    """
+    LLM summaries for split_into_sections() output.
+    All sections go out in ONE request with ===SECTION n=== markers (token-clipped,
+    split into a few batches only when the prompt would pass ~12k tokens) instead of one
+    round-trip per section. Same output shape as summarize_sections(); a section
+    the model skips, or a failed batch, keeps its extractive summary.
+    Summaries are cached by content hash (utils.summary_cache), so re-uploads of
+    the same paper only pay for sections not seen before.
+    """
+    out = summarize_sections(sections)
+    if not out:
+        return out
+
+    if llm is None:
+        try:
+            llm = get_llm()
+        except Exception as e:
+            logger.warning(f"LLM unavailable, keeping extractive summaries: {e}")
+            return out
+
+    pending = _fill_from_cache(out, mode, llm)
+    for batch in _plan_batches(pending):
+        try:
+            _merge_summaries(out, batch, llm.invoke(_batch_prompt(batch, mode)), pending)
+        except Exception as e:
+            logger.warning(f"Batched summarization failed for {len(batch)} sections: {e}")
+
+    return out
+
+
+async def asummarize_sections_groq(
+    sections: Any, mode: str = "deep", llm=None, concurrency: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    summarize_sections_groq() for async routes: the batches are sent
+    concurrently (bounded by a semaphore to respect provider rate limits).
+    """
+    out = summarize_sections(sections)
+    if not out:
+        return out
+
+    if llm is None:
+        try:
+            llm = get_llm()
+        except Exception as e:
+            logger.warning(f"LLM unavailable, keeping extractive summaries: {e}")
+            return out
+
+    # tiktoken and the diskcache reads/writes block, so they run off the event loop
+    pending = await asyncio.to_thread(_fill_from_cache, out, mode, llm)
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(batch: List[Tuple[int, str]]) -> None:
+        prompt = _batch_prompt(batch, mode)
+        async with sem:
+            try:
+                resp = await acomplete(prompt, llm)
+                await asyncio.to_thread(_merge_summaries, out, batch, resp, pending)
+            except Exception as e:
+                logger.warning(f"Batched summarization failed for {len(batch)} sections: {e}")
+
+    await asyncio.gather(*(_one(b) for b in _plan_batches(pending)))
+    return out
@@ -1,6 +1,7 @@
 # utils/relevance.py
 
 from typing import List, Dict, Any
+from operator import itemgetter
 import re
 
 # -----------------------------
@@ -38,6 +39,11 @@ def score_text_relevance(text: str) -> float:
     return round(score / 10, 2)
 
 
+def score_texts_relevance(texts: List[str]) -> List[float]:
+    """score_text_relevance over many texts (one picklable call for a process pool)."""
+    return [score_text_relevance(t) for t in texts]
+
+
 # -----------------------------
 # PUBLIC API (used everywhere)
 # -----------------------------
@@ -54,22 +60,15 @@ def score_relevance(
     if not sections or not isinstance(sections, list):
         return []
 
-    scored: List[Dict[str, Any]] = []
-
-    for sec in sections:
-        if not isinstance(sec, dict):
-            continue
-
-        text = sec.get("text", "")
-        relevance = score_text_relevance(text)
-
-        sec_out = dict(sec)
-        sec_out["relevance"] = relevance
-
-        if relevance >= min_relevance:
-            scored.append(sec_out)
+    # Score first, then sort plain (score, position) pairs; the output dicts
+    # are only built for sections that pass the filter.
+    scored = [
+        (score_text_relevance(sec.get("text", "")), i)
+        for i, sec in enumerate(sections)
+        if isinstance(sec, dict)
+    ]
 
-    # Sort highest relevance first
-    scored.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+    # Sort highest relevance first (stable, so ties keep document order)
+    ranked = sorted((p for p in scored if p[0] >= min_relevance), key=itemgetter(0), reverse=True)
 
-    return scored
+    return [{**sections[i], "relevance": relevance} for relevance, i in ranked]
@@ -0,0 +1,90 @@
+# utils/summary_cache.py
+"""
+Content-addressed cache for LLM summaries.
+- Key = sha256(kind + mode + model + text), so a changed snippet, mode or
+  GROQ_MODEL/OPENAI_MODEL never returns a stale summary
+- diskcache (LRU, 2 GB cap) under data/cache/summaries, shared by all workers
+- Falls back to a small in-process LRU when diskcache isn't installed
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from utils.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+SUMMARY_CACHE_DIR = os.path.join(DATA_DIR, "cache", "summaries")
+_SIZE_LIMIT = 2 * 1024 ** 3
+_MEMORY_MAX_ITEMS = 4096
+
+_disk = None
+_memory: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_disk():
+    global _disk
+    if _disk is None and HAS_DISKCACHE:
+        try:
+            _disk = diskcache.Cache(
+                SUMMARY_CACHE_DIR,
+                size_limit=_SIZE_LIMIT,
+                eviction_policy="least-recently-used",
+            )
+        except Exception as e:
+            logger.warning(f"Summary disk cache unavailable, using memory: {e}")
+    return _disk
+
+
+def model_name_of(llm: Any) -> str:
+    """Best-effort model id of a LangChain chat model (part of the cache key)."""
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
+
+
+def summary_key(kind: str, mode: str, model: str, text: str) -> str:
+    h = hashlib.sha256()
+    for part in (kind, mode, model):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    h.update(text.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def get_summary(key: str) -> Optional[str]:
+    disk = _get_disk()
+    if disk is not None:
+        try:
+            return disk.get(key)
+        except Exception:
+            return None
+    with _lock:
+        val = _memory.get(key)
+        if val is not None:
+            _memory.move_to_end(key)
+        return val
+
+
+def set_summary(key: str, value: str) -> None:
+    disk = _get_disk()
+    if disk is not None:
+        try:
+            disk.set(key, value)
+        except Exception as e:
+            logger.warning(f"Summary cache write failed: {e}")
+        return
+    with _lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > _MEMORY_MAX_ITEMS:
+            _memory.popitem(last=False)
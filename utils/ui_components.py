@@ -0,0 +1,120 @@
+# utils/ui_components.py
+"""
+Small helpers shared by the Streamlit pages.
+- style_block(): page CSS collapsed into one compact <style> element, built
+  once per process. Streamlit drops any element a rerun does not emit again,
+  so pages still call st.markdown(style_block(...)) on every run.
+- DEFERRED_DOWNLOAD_DATA: Streamlit >= 1.52 accepts a callable as
+  download_button data and only calls it when the user clicks
+- clean_bullets(): drops empty/filler bullets from LLM output before rendering
+- card_html(): a whole news/notes card as one HTML string, so a card costs
+  a single st.markdown call (needs the .upsc-card CSS on the page)
+- today_str(): today's date as YYYY-MM-DD, the default for the date boxes
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from html import escape as esc
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, List
+
+def _streamlit_version() -> tuple:
+    try:
+        return tuple(int(x) for x in version("streamlit").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return (0, 0)
+
+
+DEFERRED_DOWNLOAD_DATA = _streamlit_version() >= (1, 52)
+
+
+def today_str() -> str:
+    # A function, not a constant: this module outlives reruns across midnight
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+@lru_cache(maxsize=16)
+def style_block(css: str) -> str:
+    """<style> element for a CSS string, whitespace removed and memoized."""
+    body = re.sub(r"</?style>", "", css)
+    body = _CSS_PUNCT_RE.sub(r"\1", _CSS_SPACE_RE.sub(" ", body)).strip()
+    return f"<style>{body}</style>"
+
+
+_STOP = frozenset({"and", "or", "the", "of", "in", "to"})
+_ALPHA_RE = re.compile(r"[^\W\d_]")  # any letter (incl. Devanagari etc.)
+_BULLET_STRIP = " -•\t\r\n"
+
+
+def clean_bullets(bullets: List[str]) -> List[str]:
+    """Stripped bullets, minus ones that are too short, a stop word, or have no letters."""
+    return [
+        t for t in (str(b).strip(_BULLET_STRIP) for b in bullets or () if b)
+        if len(t) >= 3 and t.lower() not in _STOP and _ALPHA_RE.search(t)
+    ]
+
+
+_CARD_HEAD = (
+    '<div class="upsc-card"><div>'
+    '<span class="badge">{cat}</span>'
+    '<span class="badge">⭐ Relevance: {rel}/10</span></div>'
+    '<h4>📰 {title}</h4>'
+    '<div class="meta">{meta}</div>'
+    '<div class="sep"></div>'
+)
+
+
+def _card_meta(published: str, source: str, url: str) -> str:
+    meta = []
+    if published:
+        meta.append("📅 " + esc(published))
+    if source:
+        meta.append("🔗 " + esc(source))
+    if url:
+        meta.append(f'<a href="{esc(url)}" target="_blank">Read full</a>')
+    return " • ".join(meta)
+
+
+def card_html(it: Dict) -> str:
+    """Whole card (badges, meta, summary, bullets, tail bits) as one HTML string"""
+    cat = (it.get("category","general") or "general").replace("_"," ").title()
+    rel = int(it.get("relevance", 0))
+    title = it.get("title","(No title)")
+    source = it.get("source","")
+    published = it.get("publishedAt","")
+    url = it.get("url","") or ""
+
+    card = [_CARD_HEAD.format(cat=esc(cat), rel=rel, title=esc(str(title)),
+                             meta=_card_meta(published, source, url))]
+
+    # English-only summaries on cards
+    if it.get("summary_en"):
+        card.append('<div class="section-title">✅ Summary (English):</div>')
+        card.append(f'<p>{esc(it["summary_en"])}</p>')
+
+    # Prelims / Mains (cleaned bullets)
+    for label, key in (("📌 Prelims Pointers:", "prelims_points"), ("📝 Mains Analysis:", "mains_angles")):
+        bullets = clean_bullets(it.get(key, []))
+        if bullets:
+            card.append(f'<div class="section-title">{label}</div>')
+            card.append("<ul>" + "".join(f"<li>{esc(b)}</li>" for b in bullets) + "</ul>")
+
+    # Tail bits
+    tail_bits = []
+    if it.get("schemes_acts_policies"):
+        tail_bits.append("<b>Schemes/Acts/Policies:</b> " + esc(", ".join(it["schemes_acts_policies"])))
+    if it.get("institutions"):
+        tail_bits.append("<b>Institutions:</b> " + esc(", ".join(it["institutions"])))
+    if it.get("dates"):
+        tail_bits.append("<b>Dates:</b> " + esc(", ".join(it["dates"])))
+    if tail_bits:
+        card.append('<div class="sep"></div>')
+        card.append("<br>".join(tail_bits))
+
+    card.append("</div>")
+    return "".join(card)
@@ -6,13 +6,19 @@ Place this file as utils/vector_store.py in your project.
 Functions:
 - documents_from_articles(articles) -> List[Document]
 - get_vectorstore(documents, collection_name='default', persist_directory=..., embeddings_provider='openai')
+- get_vectorstore("YYYY-MM-DD") -> that date's store: FAISSVectorStore (exact
+  IndexFlatIP search, under data/faiss/<date>/) when faiss is installed, else Chroma
 - load_vectorstore(collection_name='default', persist_directory=...)
 - add_documents(vectorstore, documents) -> int
+- clear_vectorstore(vectorstore) -> empty one date's index in place
+- index_version("YYYY-MM-DD") -> on-disk change stamp of that date's index
 - delete_collection(collection_name, persist_directory=...)
 - list_collections(persist_directory=...)
 """
 
 import os
+import re
+from functools import lru_cache
 from typing import List, Optional, Any, Dict
 
 # ---------------------------
@@ -54,6 +60,27 @@ for _mod in (
     except Exception:
         CHROMA_CLASS = None
 
+# ---------------------------
+# Optional: FAISS (faiss-cpu + LangChain wrapper) for per-date stores
+# ---------------------------
+FAISS_CLASS = None
+DISTANCE_STRATEGY = None
+try:
+    import faiss  # noqa: F401  (the LangChain wrapper imports it lazily)
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+if HAS_FAISS:
+    for _mod in ("langchain_community.vectorstores", "langchain.vectorstores"):
+        try:
+            mod = importlib.import_module(_mod)
+            FAISS_CLASS = getattr(mod, "FAISS")
+            DISTANCE_STRATEGY = getattr(importlib.import_module(_mod + ".utils"), "DistanceStrategy")
+            break
+        except Exception:
+            FAISS_CLASS = None
+
 # ---------------------------
 # Try to import OpenAIEmbeddings (or fallback)
 # ---------------------------
@@ -91,6 +118,12 @@ if EMBEDDINGS_CLASS is None:
 DEFAULT_PERSIST_DIR = os.getenv("VECTOR_DIR", "data/vector_store")
 os.makedirs(DEFAULT_PERSIST_DIR, exist_ok=True)
 
+# Per-date stores: "faiss" (default when available) or "chroma"
+FAISS_DIR = os.getenv("FAISS_DIR", "data/faiss")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "faiss").lower()
+# Dates become directory names, so only allow plain tokens like 2025-01-31
+_SAFE_NAME = re.compile(r"[A-Za-z0-9_-]{1,63}")
+
 
 # ---------------------------
 # Helpers
@@ -131,9 +164,17 @@ def documents_from_articles(articles: List[Dict]) -> List[Any]:
     return docs
 
 
-def _build_embeddings(provider: str = "openai", **kwargs) -> Any:
+# Documents per add call: one embed_documents request/forward pass each,
+# bounded so a large PDF ingest doesn't hold every vector at once
+EMBED_BATCH = 512
+SBERT_BATCH_SIZE = 64
+
+
+@lru_cache(maxsize=4)
+def _build_embeddings(provider: str = "openai") -> Any:
     """
     Build embeddings object. provider can be 'openai' or 'sentence-transformers'.
+    Cached per provider: the SentenceTransformer model is loaded once per process.
     """
     provider = (provider or os.getenv("EMBEDDINGS_PROVIDER", "openai")).lower()
 
@@ -159,16 +200,86 @@ def _build_embeddings(provider: str = "openai", **kwargs) -> Any:
 
         class _SbertWrapper:
             def embed_documents(self, texts: List[str]) -> List[List[float]]:
-                return [list(x) for x in model.encode(texts, show_progress_bar=False)]
+                # one batched encode for the whole list; tolist() gives plain floats
+                return model.encode(
+                    texts, batch_size=SBERT_BATCH_SIZE, convert_to_numpy=True,
+                    normalize_embeddings=True, show_progress_bar=False,
+                ).tolist()
 
             def embed_query(self, text: str) -> List[float]:
-                return list(model.encode([text])[0])
+                return model.encode([text], convert_to_numpy=True, normalize_embeddings=True)[0].tolist()
 
         return _SbertWrapper()
 
     raise RuntimeError(f"Unknown embeddings provider: {provider}")
 
 
+class FAISSVectorStore:
+    """
+    One date's index as an exact FAISS IndexFlatIP over L2-normalized embeddings
+    (cosine ranking, no HNSW/SQLite overhead; daily corpora are far below the
+    size where approximate search pays off). Persisted with save_local under
+    `path` after every write. Mirrors the Chroma calls the pages make:
+    add_documents, similarity_search, as_retriever, persist, delete_collection,
+    _persist_directory.
+    """
+
+    def __init__(self, path: str, embedding: Any):
+        self._persist_directory = path
+        self.embedding = embedding
+        self._store = None
+        if os.path.exists(os.path.join(path, "index.faiss")):
+            # Only reads files this app wrote itself (pickled docstore)
+            kwargs = {"normalize_L2": True, "distance_strategy": DISTANCE_STRATEGY.MAX_INNER_PRODUCT}
+            try:
+                self._store = FAISS_CLASS.load_local(path, embedding, allow_dangerous_deserialization=True, **kwargs)
+            except TypeError:  # older langchain: no opt-in flag
+                self._store = FAISS_CLASS.load_local(path, embedding, **kwargs)
+
+    def __len__(self) -> int:
+        return 0 if self._store is None else self._store.index.ntotal
+
+    def add_documents(self, documents: List[Document], persist: bool = True) -> List[str]:
+        """Index documents; persist=False leaves saving to one persist() after a batch loop."""
+        if not documents:
+            return []
+        if self._store is None:
+            self._store = FAISS_CLASS.from_documents(
+                documents, self.embedding,
+                normalize_L2=True, distance_strategy=DISTANCE_STRATEGY.MAX_INNER_PRODUCT,
+            )
+            ids = list(self._store.index_to_docstore_id.values())
+        else:
+            ids = self._store.add_documents(documents)
+        if persist:
+            self.persist()
+        return ids
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        if self._store is None:
+            return []
+        return self._store.similarity_search(query, k=k, **kwargs)
+
+    def as_retriever(self, **kwargs) -> Any:
+        if self._store is None:
+            raise RuntimeError(f"No documents indexed in {self._persist_directory}")
+        return self._store.as_retriever(**kwargs)
+
+    def persist(self) -> None:
+        if self._store is not None:
+            os.makedirs(self._persist_directory, exist_ok=True)
+            self._store.save_local(self._persist_directory)
+
+    def delete_collection(self) -> None:
+        """Drop this date's vectors: the in-memory index and its two save_local files."""
+        self._store = None
+        for name in ("index.faiss", "index.pkl"):
+            try:
+                os.remove(os.path.join(self._persist_directory, name))
+            except FileNotFoundError:
+                pass
+
+
 def get_vectorstore(
     documents: Optional[List[Document]] = None,
     collection_name: str = "default",
@@ -188,7 +299,21 @@ def get_vectorstore(
     - chroma_kwargs: extra kwargs passed to Chroma.from_documents or Chroma constructor.
 
     Returns: vectorstore object (LangChain/Chroma wrapper)
+
+    A plain string as first argument is a date / collection name (how the
+    pages and the /rag route call it): that date's FAISSVectorStore when FAISS
+    is available and VECTOR_BACKEND isn't "chroma", else its Chroma collection.
     """
+    if isinstance(documents, str):
+        collection_name, documents = documents, None
+        if not _SAFE_NAME.fullmatch(collection_name):
+            raise ValueError(f"Invalid index date: {collection_name!r}")
+        if FAISS_CLASS is not None and VECTOR_BACKEND != "chroma":
+            return FAISSVectorStore(
+                os.path.join(FAISS_DIR, collection_name),
+                _build_embeddings(provider=embeddings_provider),
+            )
+
     persist_directory = persist_directory or DEFAULT_PERSIST_DIR
     os.makedirs(persist_directory, exist_ok=True)
 
@@ -292,9 +417,16 @@ def add_documents(vectorstore: Any, documents: List[Document]) -> int:
         return 0
     
     try:
-        # Most vectorstore implementations have add_documents method
+        # Most vectorstore implementations have add_documents method; each call
+        # embeds its documents with a single embed_documents() request
         if hasattr(vectorstore, 'add_documents'):
-            vectorstore.add_documents(documents)
+            # FAISS save_local rewrites the whole index, so save once after the loop
+            faiss_store = isinstance(vectorstore, FAISSVectorStore)
+            kwargs = {"persist": False} if faiss_store else {}
+            for i in range(0, len(documents), EMBED_BATCH):
+                vectorstore.add_documents(documents[i:i + EMBED_BATCH], **kwargs)
+            if faiss_store:
+                vectorstore.persist()
             return len(documents)
         else:
             raise AttributeError("Vectorstore does not have add_documents method")
@@ -302,6 +434,45 @@ def add_documents(vectorstore: Any, documents: List[Document]) -> int:
         raise RuntimeError(f"Failed to add documents to vectorstore: {e}")
 
 
+def index_version(collection_name: str) -> Optional[int]:
+    """
+    mtime_ns of the files get_vectorstore(collection_name) would load
+    (FAISS index.faiss, or the shared Chroma database), None if absent.
+    Lets long-lived processes notice a rebuild done by another process.
+    """
+    if FAISS_CLASS is not None and VECTOR_BACKEND != "chroma":
+        path = os.path.join(FAISS_DIR, collection_name, "index.faiss")
+    else:
+        path = os.path.join(DEFAULT_PERSIST_DIR, "chroma.sqlite3")
+        if not os.path.exists(path):
+            path = DEFAULT_PERSIST_DIR
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def clear_vectorstore(vectorstore: Any) -> None:
+    """
+    Remove every vector of one store (one date's index) and leave other dates alone.
+    FAISSVectorStore and LangChain's Chroma both have delete_collection(); a
+    Chroma persist directory holds every date's collection, so it is only
+    removed for wrappers without that method.
+    """
+    try:
+        if hasattr(vectorstore, "delete_collection"):
+            vectorstore.delete_collection()
+            return
+        base = getattr(vectorstore, "_persist_directory", None)
+        if not base:
+            raise AttributeError("Vectorstore has neither delete_collection nor a persist directory")
+        import shutil
+        shutil.rmtree(base, ignore_errors=True)
+        os.makedirs(base, exist_ok=True)
+    except Exception as e:
+        raise RuntimeError(f"Failed to clear vectorstore: {e}")
+
+
 def delete_collection(collection_name: str, persist_directory: Optional[str] = None) -> bool:
     """
     Delete a collection from the vector store.
@@ -366,7 +537,9 @@ def get_collection_stats(vectorstore: Any) -> Dict[str, Any]:
         stats = {}
         
         # Try to get document count
-        if hasattr(vectorstore, '_collection'):
+        if isinstance(vectorstore, FAISSVectorStore):
+            stats['document_count'] = len(vectorstore)
+        elif hasattr(vectorstore, '_collection'):
             collection = vectorstore._collection
             if hasattr(collection, 'count'):
                 stats['document_count'] = collection.count()